@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Database migration script to normalize order items.
+
+Moves the JSON `items` column of the orders table into the order_items
+table (one row per line item) and then drops the old column. The same
+migration also runs automatically from DatabaseManager.initialize_database.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import get_config_manager
+from src.database.db_manager import create_database_manager
+from src.utils import get_logger
+
+
+def migrate_database():
+    """Move order items from JSON blobs into the order_items table."""
+    logger = get_logger("migration")
+
+    try:
+        # Get database configuration
+        config = get_config_manager()
+        db_path = config.get("database.path", "data/p3edge.db")
+        encryption_key = config.get_database_encryption_key()
+
+        logger.info(f"Migrating database: {db_path}")
+
+        # Check if database exists
+        if not Path(db_path).exists():
+            logger.error(f"Database not found: {db_path}")
+            logger.error("Please run 'python scripts/init_db.py' first")
+            return False
+
+        # Connect to database
+        db_manager = create_database_manager(db_path, encryption_key)
+
+        # Check if orders still has the legacy items column
+        columns = db_manager.get_column_names("orders")
+
+        if "items" not in columns:
+            logger.info("orders.items already migrated, skipping migration")
+            db_manager.close()
+            return True
+
+        # initialize_database copies the JSON items into order_items and
+        # rebuilds orders without the legacy column
+        db_manager.initialize_database()
+
+        logger.info("Migration completed successfully")
+
+        # Close database
+        db_manager.close()
+
+        return True
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Main entry point."""
+    logger = get_logger("migration")
+
+    logger.info("=" * 60)
+    logger.info("P3-Edge Database Migration")
+    logger.info("Normalizing order items into the order_items table")
+    logger.info("=" * 60)
+
+    success = migrate_database()
+
+    if success:
+        logger.info("\n" + "=" * 60)
+        logger.info("Migration completed successfully!")
+        logger.info("=" * 60)
+        return 0
+    else:
+        logger.error("\n" + "=" * 60)
+        logger.error("Migration failed!")
+        logger.error("=" * 60)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,8 +11,12 @@ Usage:
 
 import argparse
 import base64
+import os
 import sys
+from bisect import bisect_right
+from collections import deque
 from pathlib import Path
+from typing import Optional
 
 from cryptography.fernet import Fernet
 
@@ -41,13 +45,127 @@ def load_encryption_key(key_path: str = "config/.key") -> bytes:
         return f.read()
 
 
-def decrypt_log_file(log_path: str, encryption_key: bytes) -> list:
+# Read buffer for log streaming; large enough to keep syscalls low on
+# multi-megabyte rotated logs.
+READ_BUFFER_SIZE = 1 << 20
+
+# Decrypted records swept per grep pass; bounds memory while filtering
+GREP_BATCH_SIZE = 4096
+
+
+def _open_log_for_streaming(log_file: Path):
+    """
+    Open a log file for a single sequential read pass.
+
+    Uses O_NOATIME (when permitted) to avoid atime updates and hints the
+    kernel with POSIX_FADV_SEQUENTIAL so it can prefetch aggressively.
+
+    Args:
+        log_file: Path to log file
+
+    Returns:
+        Buffered binary file object
+    """
+    flags = os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0)
+    noatime = getattr(os, 'O_NOATIME', 0)
+
+    try:
+        fd = os.open(str(log_file), flags | noatime)
+    except PermissionError:
+        # O_NOATIME is only allowed for the file owner
+        if not noatime:
+            raise
+        fd = os.open(str(log_file), flags)
+
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+    return os.fdopen(fd, 'rb', buffering=READ_BUFFER_SIZE)
+
+
+def _find_matching_records(records: list, grep_bytes: bytes) -> list:
+    """
+    Select the records containing grep_bytes with a single sweep.
+
+    Records are joined into one buffer and scanned with bytes.find, so the
+    search runs in C rather than once per line in Python. Record offsets
+    are used to map hits back to whole records, which keeps multi-line
+    messages (e.g. tracebacks) intact.
+
+    Args:
+        records: Decrypted log records
+        grep_bytes: Bytes to search for
+
+    Returns:
+        Indices of matching records in file order
+
+    Raises:
+        ValueError: If grep_bytes contains a newline (it could then match
+            across the separator between two records)
+    """
+    if b"\n" in grep_bytes:
+        raise ValueError("grep pattern cannot contain a newline")
+
+    starts = []
+    offset = 0
+    for record in records:
+        starts.append(offset)
+        offset += len(record) + 1
+
+    buf = b"\n".join(records)
+    matches = []
+    idx = 0
+    while (pos := buf.find(grep_bytes, idx)) != -1:
+        record_idx = bisect_right(starts, pos) - 1
+        matches.append(record_idx)
+        # Resume after the matched record
+        idx = starts[record_idx] + len(records[record_idx]) + 1
+
+    return matches
+
+
+def _keep_matching_records(
+    records: list,
+    line_numbers: list,
+    grep_bytes: bytes,
+    kept: deque
+) -> None:
+    """
+    Move the records of one batch that contain grep_bytes into kept.
+
+    Args:
+        records: Decrypted log records of the batch (cleared afterwards)
+        line_numbers: File line number of each record (cleared afterwards)
+        grep_bytes: Bytes to search for
+        kept: (line number, record) pairs selected so far
+    """
+    for i in _find_matching_records(records, grep_bytes):
+        kept.append((line_numbers[i], records[i]))
+    records.clear()
+    line_numbers.clear()
+
+
+def decrypt_log_file(
+    log_path: str,
+    encryption_key: bytes,
+    grep_bytes: Optional[bytes] = None,
+    tail: Optional[int] = None
+) -> list:
     """
     Decrypt an encrypted log file.
 
+    Filtering happens on the decrypted bytes so that lines which don't match
+    are never UTF-8 decoded. Records are grep-filtered in batches as the
+    file is read, and with tail only the last N matches are held.
+
     Args:
         log_path: Path to encrypted log file
         encryption_key: Encryption key
+        grep_bytes: Only keep lines containing these bytes
+        tail: Only keep the last N matching lines
 
     Returns:
         List of decrypted log lines
@@ -60,9 +178,14 @@ def decrypt_log_file(log_path: str, encryption_key: bytes) -> list:
         raise FileNotFoundError(f"Log file not found: {log_path}")
 
     cipher = Fernet(encryption_key)
-    decrypted_lines = []
 
-    with open(log_file, 'rb') as f:
+    # (line number, record) pairs; with tail set, older entries fall off
+    # the front so memory stays bounded by tail
+    kept = deque(maxlen=tail or None)
+    batch_records = []
+    batch_line_numbers = []
+
+    with _open_log_for_streaming(log_file) as f:
         for line_num, line in enumerate(f, 1):
             line = line.strip()
             if not line:
@@ -75,13 +198,30 @@ def decrypt_log_file(log_path: str, encryption_key: bytes) -> list:
                 # Decrypt
                 decrypted_msg = cipher.decrypt(encrypted_data)
 
-                # Decode to string
-                decrypted_line = decrypted_msg.decode('utf-8')
-                decrypted_lines.append(decrypted_line)
-
             except Exception as e:
                 print(f"Warning: Failed to decrypt line {line_num}: {e}", file=sys.stderr)
-                decrypted_lines.append(f"[DECRYPTION ERROR at line {line_num}]")
+                decrypted_msg = f"[DECRYPTION ERROR at line {line_num}]".encode()
+
+            if not grep_bytes:
+                kept.append((line_num, decrypted_msg))
+                continue
+
+            batch_records.append(decrypted_msg)
+            batch_line_numbers.append(line_num)
+            if len(batch_records) >= GREP_BATCH_SIZE:
+                _keep_matching_records(batch_records, batch_line_numbers, grep_bytes, kept)
+
+    if batch_records:
+        _keep_matching_records(batch_records, batch_line_numbers, grep_bytes, kept)
+
+    decrypted_lines = []
+    for line_num, decrypted_msg in kept:
+        # Decode to string
+        try:
+            decrypted_lines.append(decrypted_msg.decode('utf-8'))
+        except UnicodeDecodeError as e:
+            print(f"Warning: Failed to decrypt line {line_num}: {e}", file=sys.stderr)
+            decrypted_lines.append(f"[DECRYPTION ERROR at line {line_num}]")
 
     return decrypted_lines
 
@@ -112,15 +252,15 @@ def view_logs(
             print("Use --tail or --grep instead.", file=sys.stderr)
             sys.exit(1)
 
-        # Decrypt log file
-        lines = decrypt_log_file(log_path, encryption_key)
-
-        # Apply filters
-        if grep:
-            lines = [line for line in lines if grep in line]
+        # Records are joined with newlines for the grep sweep, so a pattern
+        # spanning a newline could match across two records
+        if grep and "\n" in grep:
+            print("Error: --grep pattern cannot contain a newline", file=sys.stderr)
+            sys.exit(1)
 
-        if tail:
-            lines = lines[-tail:]
+        # Decrypt log file; grep and tail are applied while it is read
+        grep_bytes = grep.encode() if grep else None
+        lines = decrypt_log_file(log_path, encryption_key, grep_bytes=grep_bytes, tail=tail)
 
         # Print results
         for line in lines:
@@ -136,6 +276,17 @@ def view_logs(
         sys.exit(1)
 
 
+def _non_negative_int(value: str) -> int:
+    """argparse type for --tail: an integer >= 0."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be a non-negative integer, got {value!r}")
+    return number
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -166,7 +317,7 @@ Examples:
 
     parser.add_argument(
         '--tail',
-        type=int,
+        type=_non_negative_int,
         metavar='N',
         help='Show only last N lines'
     )
@@ -13,8 +13,10 @@ from typing import Dict, List
 
 from fastapi import FastAPI, File, HTTPException, UploadFile
 from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 
 from src.ingestion import ReceiptOCR, process_receipt_image
+from src.models import InventoryItem
 from src.services import InventoryService
 from src.utils import get_logger
 
@@ -45,7 +47,25 @@ def init_api(service: InventoryService, upload_dir: str = "data/receipts"):
     receipt_upload_dir = Path(upload_dir)
     receipt_upload_dir.mkdir(parents=True, exist_ok=True)
 
-    logger.info(f"Phone app API initialized, upload dir: {receipt_upload_dir}")
+    logger.info("Phone app API initialized, upload dir: %s", receipt_upload_dir)
+
+
+def _file_suffix(filename: str) -> str:
+    """
+    Get the extension of an uploaded filename without building a Path.
+
+    Args:
+        filename: Client-supplied filename (may be None)
+
+    Returns:
+        Suffix including the leading dot, or "" if there is none
+    """
+    name = filename or ""
+    name = name[name.rfind("/") + 1:]
+    dot = name.rfind(".")
+    if 0 < dot < len(name) - 1:
+        return name[dot:]
+    return ""
 
 
 @app.get("/")
@@ -91,15 +111,15 @@ async def upload_receipt(file: UploadFile = File(...)) -> Dict:
 
     try:
         # Generate unique filename
-        file_id = str(uuid.uuid4())
-        file_ext = Path(file.filename).suffix or ".jpg"
+        file_id = uuid.uuid4().hex
+        file_ext = _file_suffix(file.filename) or ".jpg"
         save_path = receipt_upload_dir / f"{file_id}{file_ext}"
 
         # Save uploaded file
         with open(save_path, "wb") as f:
             shutil.copyfileobj(file.file, f)
 
-        logger.info(f"Receipt uploaded: {save_path}")
+        logger.info("Receipt uploaded: %s", save_path)
 
         # Process receipt (async to not block)
         extracted_items = await asyncio.to_thread(process_receipt_image, str(save_path))
@@ -116,7 +136,7 @@ async def upload_receipt(file: UploadFile = File(...)) -> Dict:
             for item in extracted_items
         ]
 
-        logger.info(f"Extracted {len(extracted_items)} items from receipt")
+        logger.info("Extracted %d items from receipt", len(extracted_items))
 
         return {
             "status": "success",
@@ -128,7 +148,7 @@ async def upload_receipt(file: UploadFile = File(...)) -> Dict:
         }
 
     except Exception as e:
-        logger.error(f"Receipt processing failed: {e}")
+        logger.error("Receipt processing failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
 
@@ -148,23 +168,51 @@ async def confirm_receipt_items(receipt_id: str, items: List[Dict]) -> Dict:
         raise HTTPException(status_code=500, detail="Inventory service not initialized")
 
     try:
-        added_count = 0
+        # This would need more sophisticated matching logic in production
+        # For now, every confirmed item is added as a new inventory entry.
+        # Items that fail validation are reported instead of failing the batch
+        new_items = []
+        rejected = []
+        for index, item_data in enumerate(items):
+            try:
+                new_items.append(
+                    InventoryItem(
+                        name=item_data.get("name"),
+                        unit=item_data.get("unit"),
+                        quantity_current=item_data.get("quantity") or 0.0,
+                        metadata={"receipt_id": receipt_id, "price": item_data.get("price")},
+                    )
+                )
+            except ValidationError as e:
+                rejected.append(
+                    {
+                        "index": index,
+                        "name": item_data.get("name"),
+                        "errors": [error["msg"] for error in e.errors()],
+                    }
+                )
+
+        added_count = await asyncio.to_thread(
+            inventory_service.create_items, new_items, "receipt"
+        )
 
-        for item_data in items:
-            # This would need more sophisticated matching logic in production
-            # For now, we just log the items
-            logger.info(f"Confirmed item: {item_data.get('name')}")
-            added_count += 1
+        logger.info("Confirmed %d items from receipt %s", added_count, receipt_id)
+        if rejected:
+            logger.warning(
+                "Rejected %d invalid items from receipt %s", len(rejected), receipt_id
+            )
 
         return {
-            "status": "success",
+            "status": "partial" if rejected else "success",
             "receipt_id": receipt_id,
             "items_added": added_count,
-            "message": f"Added {added_count} items to inventory",
+            "items_rejected": rejected,
+            "message": f"Added {added_count} items to inventory"
+            + (f", rejected {len(rejected)} invalid items" if rejected else ""),
         }
 
     except Exception as e:
-        logger.error(f"Failed to confirm receipt items: {e}")
+        logger.error("Failed to confirm receipt items: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -295,10 +295,23 @@ class ConfigManager:
 
         Args:
             import_path: Path to import file
+
+        Raises:
+            json.JSONDecodeError: If the file is not valid JSON
+            ValueError: If the file or one of its sections is not an object
         """
         with open(import_path, 'r') as f:
             import_data = json.load(f)
 
+        if not isinstance(import_data, dict):
+            raise ValueError("Import file must contain a JSON object")
+
+        # Validate every section before applying any of them, so a bad
+        # file leaves the current configuration untouched
+        for key in ("config", "credentials"):
+            if key in import_data and not isinstance(import_data[key], dict):
+                raise ValueError(f"Import section '{key}' must be a JSON object")
+
         if "config" in import_data:
             self.config = import_data["config"]
             self.save_config()
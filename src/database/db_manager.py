@@ -5,9 +5,18 @@ This module handles all database operations with encryption at rest.
 """
 
 import os
+import re
 import json
+import queue
+import logging
+import hashlib
 import sqlite3
+import threading
+from collections import namedtuple
+from collections.abc import Iterable, Iterator
 from contextlib import contextmanager
+from itertools import groupby, islice
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
@@ -19,7 +28,136 @@ except ImportError:
     SQLCIPHER_AVAILABLE = False
     import sqlite3 as sqlcipher  # Fallback for development
 
-from ..models.order import Order
+from ..models.order import Order, OrderItem, OrderStatus, Vendor
+
+logger = logging.getLogger(__name__)
+
+
+# Raw SQLCipher keys: 64 hex chars, optionally already wrapped as x'...'
+_RAW_KEY_RE = re.compile(r"(?:x'([0-9A-Fa-f]{64})'|([0-9A-Fa-f]{64}))")
+
+# One row of PRAGMA table_info
+ColumnInfo = namedtuple("ColumnInfo", "cid name type notnull dflt_value pk")
+
+# Table names interpolated into SQL must be plain identifiers
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# Fixed salt for deriving a raw key from a passphrase. The stored key is
+# already derived from the user's password and salt (see init_db.py), so
+# this step only turns it into the 256-bit form SQLCipher takes directly.
+_KDF_SALT = b"p3edge-sqlcipher-raw-key"
+
+# Per-connection tuning, applied once the connection is keyed. journal_mode
+# is persistent in the database file so it is handled separately.
+_CONNECTION_PRAGMAS = """
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -64000;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA foreign_keys = ON;
+"""
+
+# Order statements are kept as module constants so every call passes the
+# same SQL text and hits the connection's prepared-statement cache.
+_SQL_INSERT_ORDER = """
+    INSERT INTO orders (
+        order_id, vendor, status, total_cost,
+        created_at, approved_at, placed_at, user_notes, auto_generated
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_ORDER_ITEM = """
+    INSERT INTO order_items (
+        order_id, idx, item_id, product_id, name, quantity, price, unit, brand
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_DELETE_ORDER_ITEMS = "DELETE FROM order_items WHERE order_id = ?"
+
+_SQL_UPDATE_ORDER = """
+    UPDATE orders
+    SET vendor = ?, status = ?, total_cost = ?,
+        approved_at = ?, placed_at = ?, user_notes = ?
+    WHERE order_id = ?
+"""
+
+# Orders joined with their items; one row per item, grouped back in Python.
+# Timestamp columns are tagged so the registered converter parses them.
+_SQL_SELECT_ORDER_COLUMNS = """
+    SELECT o.order_id, o.vendor, o.status, o.total_cost,
+           o.created_at AS "created_at [isodatetime]",
+           o.approved_at AS "approved_at [isodatetime]",
+           o.placed_at AS "placed_at [isodatetime]",
+           o.user_notes, o.auto_generated,
+           i.item_id, i.product_id, i.name, i.quantity, i.price, i.unit, i.brand
+    FROM orders o
+    LEFT JOIN order_items i ON i.order_id = o.order_id
+"""
+
+_SQL_SELECT_ORDER = _SQL_SELECT_ORDER_COLUMNS + """
+    WHERE o.order_id = ?
+    ORDER BY i.idx
+"""
+
+_SQL_SELECT_ALL_ORDERS = _SQL_SELECT_ORDER_COLUMNS + """
+    ORDER BY o.created_at DESC, o.order_id, i.idx
+"""
+
+# Databases created before order_items keep line items as a JSON array in
+# orders.items. initialize_database moves them into order_items and rebuilds
+# orders without the column (a table rebuild, since ALTER TABLE ... DROP
+# COLUMN needs SQLite 3.35+).
+
+_SQL_CREATE_ORDERS_REBUILD = """
+    CREATE TABLE orders_rebuild (
+        order_id TEXT PRIMARY KEY,
+        vendor TEXT NOT NULL,
+        status TEXT NOT NULL,
+        total_cost REAL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        approved_at DATETIME,
+        placed_at DATETIME,
+        delivered_at DATETIME,
+        user_notes TEXT,
+        auto_generated INTEGER DEFAULT 1,
+        vendor_order_id TEXT
+    )
+"""
+
+_ORDERS_REBUILD_COLUMNS = (
+    "order_id, vendor, status, total_cost, created_at, approved_at,"
+    " placed_at, delivered_at, user_notes, auto_generated, vendor_order_id"
+)
+
+_SQL_ORDERS_REBUILD = (
+    "INSERT INTO orders_rebuild (" + _ORDERS_REBUILD_COLUMNS + ")"
+    " SELECT " + _ORDERS_REBUILD_COLUMNS + " FROM orders",
+    "DROP TABLE orders",
+    "ALTER TABLE orders_rebuild RENAME TO orders",
+    "CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_vendor ON orders(vendor)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_created ON orders(created_at)",
+)
+
+# Prepared statements cached per pooled connection
+_STATEMENT_CACHE_SIZE = 256
+
+# Rows fetched per round-trip when streaming result sets
+_FETCH_BATCH_SIZE = 1000
+
+# Pages copied per step by backup()
+_BACKUP_PAGES_PER_STEP = 1024
+
+
+def _convert_isodatetime(value: bytes) -> datetime:
+    """Parse an ISO-8601 timestamp column inside the sqlite3 C layer."""
+    return datetime.fromisoformat(value.decode())
+
+
+# Converters apply only to result columns tagged "[isodatetime]"
+sqlite3.register_converter("isodatetime", _convert_isodatetime)
+if SQLCIPHER_AVAILABLE:
+    sqlcipher.register_converter("isodatetime", _convert_isodatetime)
 
 
 class DatabaseManager:
@@ -29,49 +167,266 @@ class DatabaseManager:
     Provides secure storage for all application data with AES-256 encryption.
     """
 
-    def __init__(self, db_path: str, encryption_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        encryption_key: Optional[str] = None,
+        min_pool_size: int = 1,
+        max_pool_size: int = 4,
+        pool_timeout: float = 30.0,
+        kdf_iter: int = 256000
+    ) -> None:
         """
         Initialize database manager.
 
+        The encryption key may be a raw key (64 hex chars, optionally as
+        x'...') or a passphrase. A passphrase is run through PBKDF2 once here
+        and the result is used as a raw key, so SQLCipher never runs its own
+        KDF when a connection is opened.
+
         Args:
             db_path: Path to the database file
             encryption_key: Encryption key for SQLCipher (None uses unencrypted for dev)
+            min_pool_size: Connections opened up front
+            max_pool_size: Maximum number of pooled connections
+            pool_timeout: Seconds to wait for a free connection
+            kdf_iter: PBKDF2 iterations used to derive a raw key from a passphrase
         """
         self.db_path = Path(db_path)
         self.encryption_key = encryption_key
         self.is_encrypted = encryption_key is not None and SQLCIPHER_AVAILABLE
 
+        # Raw key passed to PRAGMA key; derived once per manager
+        self.kdf_iter = kdf_iter
+        self._raw_key = self._derive_raw_key(encryption_key) if self.is_encrypted else None
+
+        # PRAGMA does not accept bound parameters, so build the keying
+        # statements once; the passphrase has its quotes escaped
+        self._key_pragma = None
+        self._legacy_key_pragma = None
+        if self.is_encrypted:
+            self._key_pragma = f"PRAGMA key = \"x'{self._raw_key}'\""
+            self._legacy_key_pragma = (
+                "PRAGMA key = '" + encryption_key.replace("'", "''") + "'"
+            )
+
+        # Databases created before raw keys were used are keyed with the
+        # passphrase; detected on the first connection and remembered
+        self._key_checked = False
+        self._legacy_key = False
+
         # Ensure database directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Schema file path
         self.schema_path = Path(__file__).parent / "schema.sql"
 
-    @contextmanager
-    def get_connection(self):
+        # WAL mode only needs to be switched on once per database file
+        self._wal_enabled = False
+
+        # Connection pool. Opening a connection is expensive (SQLCipher runs
+        # its KDF on every key), so connections are keyed once and reused.
+        self.max_pool_size = max(1, max_pool_size)
+        self.pool_timeout = pool_timeout
+        self._pool: queue.Queue = queue.Queue(maxsize=self.max_pool_size)
+        self._pool_lock = threading.Lock()
+        self._pool_created = 0
+
+        for _ in range(min(min_pool_size, self.max_pool_size)):
+            self._pool.put(self._open_connection())
+            self._pool_created += 1
+
+    def _open_connection(self):
         """
-        Context manager for database connections.
+        Open, key and configure a new database connection.
 
-        Yields:
+        Returns:
             Database connection object
         """
         if self.is_encrypted:
-            conn = sqlcipher.connect(str(self.db_path))
-            # Set encryption key
-            conn.execute(f"PRAGMA key = '{self.encryption_key}'")
-            # Enable foreign keys
-            conn.execute("PRAGMA foreign_keys = ON")
-            # Set cipher settings for better security
-            conn.execute("PRAGMA cipher_page_size = 4096")
-            conn.execute("PRAGMA kdf_iter = 256000")
+            conn = sqlcipher.connect(
+                str(self.db_path),
+                check_same_thread=False,
+                cached_statements=_STATEMENT_CACHE_SIZE,
+                detect_types=sqlcipher.PARSE_COLNAMES
+            )
+            conn = self._key_connection(conn)
             # Use sqlcipher's Row class for encrypted connections
             conn.row_factory = sqlcipher.Row
         else:
-            conn = sqlite3.connect(str(self.db_path))
-            conn.execute("PRAGMA foreign_keys = ON")
+            conn = sqlite3.connect(
+                str(self.db_path),
+                check_same_thread=False,
+                cached_statements=_STATEMENT_CACHE_SIZE,
+                detect_types=sqlite3.PARSE_COLNAMES
+            )
             # Use sqlite3's Row class for unencrypted connections
             conn.row_factory = sqlite3.Row
 
+        self._configure_connection(conn)
+        return conn
+
+    def _derive_raw_key(self, encryption_key: str) -> str:
+        """
+        Turn the configured encryption key into a 64-hex-char raw key.
+
+        Args:
+            encryption_key: Raw hex key or passphrase
+
+        Returns:
+            Hex-encoded 256-bit key
+        """
+        match = _RAW_KEY_RE.fullmatch(encryption_key)
+        if match:
+            return (match.group(1) or match.group(2)).lower()
+
+        return hashlib.pbkdf2_hmac(
+            'sha512',
+            encryption_key.encode('utf-8'),
+            _KDF_SALT,
+            self.kdf_iter,
+            dklen=32
+        ).hex()
+
+    def _key_connection(self, conn):
+        """
+        Key a new SQLCipher connection.
+
+        Uses the raw key (no KDF). The first connection checks the key
+        against the database; if it is rejected the database predates raw
+        keys, and it and every later connection fall back to the original
+        passphrase settings.
+
+        Args:
+            conn: Unkeyed SQLCipher connection
+
+        Returns:
+            Keyed connection (a new one if the legacy fallback was needed)
+        """
+        if self._legacy_key:
+            return self._key_connection_legacy(conn)
+
+        conn.execute(self._key_pragma)
+        conn.execute("PRAGMA cipher_page_size = 4096")
+
+        if not self._key_checked:
+            try:
+                conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            except sqlcipher.DatabaseError:
+                conn.close()
+                self._legacy_key = True
+                conn = sqlcipher.connect(
+                    str(self.db_path),
+                    check_same_thread=False,
+                    cached_statements=_STATEMENT_CACHE_SIZE,
+                    detect_types=sqlcipher.PARSE_COLNAMES
+                )
+                conn = self._key_connection_legacy(conn)
+            self._key_checked = True
+
+        return conn
+
+    def _key_connection_legacy(self, conn):
+        """
+        Key a connection to a database created with the passphrase KDF.
+
+        Args:
+            conn: Unkeyed SQLCipher connection
+
+        Returns:
+            Keyed connection
+        """
+        # Set encryption key
+        conn.execute(self._legacy_key_pragma)
+        # Set cipher settings for better security
+        conn.execute("PRAGMA cipher_page_size = 4096")
+        conn.execute("PRAGMA kdf_iter = 256000")
+        return conn
+
+    def _acquire_connection(self):
+        """
+        Take a connection from the pool, opening one if below max size.
+
+        Returns:
+            Database connection object
+
+        Raises:
+            TimeoutError: If no connection becomes free within pool_timeout
+        """
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._pool_lock:
+            can_open = self._pool_created < self.max_pool_size
+            if can_open:
+                self._pool_created += 1
+
+        if can_open:
+            try:
+                return self._open_connection()
+            except Exception:
+                with self._pool_lock:
+                    self._pool_created -= 1
+                raise
+
+        try:
+            return self._pool.get(timeout=self.pool_timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No database connection available after {self.pool_timeout}s"
+            ) from None
+
+    def _release_connection(self, conn) -> None:
+        """
+        Return a connection to the pool.
+
+        Args:
+            conn: Database connection object
+        """
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            self._close_connection(conn)
+            with self._pool_lock:
+                self._pool_created -= 1
+
+    @staticmethod
+    def _close_connection(conn) -> None:
+        """
+        Close a connection, letting SQLite refresh planner stats first.
+
+        PRAGMA optimize is designed to run right before closing and is a
+        near no-op when the statistics are still current.
+
+        Args:
+            conn: Database connection object
+        """
+        # Pooled connections may come from either driver; a failure on one
+        # connection must not abort shutdown of the rest of the pool
+        try:
+            conn.execute("PRAGMA optimize")
+        except (sqlite3.Error, sqlcipher.Error):
+            pass
+        try:
+            conn.close()
+        except (sqlite3.Error, sqlcipher.Error) as e:
+            logger.warning("Failed to close database connection: %s", e)
+
+    @contextmanager
+    def get_connection(self):
+        """
+        Context manager for pooled database connections.
+
+        Commits on success and rolls back on error; the connection is then
+        returned to the pool rather than closed.
+
+        Yields:
+            Database connection object
+        """
+        conn = self._acquire_connection()
+
         try:
             yield conn
             conn.commit()
@@ -79,7 +434,20 @@ class DatabaseManager:
             conn.rollback()
             raise e
         finally:
-            conn.close()
+            self._release_connection(conn)
+
+    def _configure_connection(self, conn) -> None:
+        """
+        Apply performance PRAGMAs to a freshly opened (and keyed) connection.
+
+        Args:
+            conn: Database connection
+        """
+        if not self._wal_enabled:
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._wal_enabled = True
+
+        conn.executescript(_CONNECTION_PRAGMAS)
 
     def initialize_database(self) -> None:
         """
@@ -97,12 +465,84 @@ class DatabaseManager:
         # Execute schema
         with self.get_connection() as conn:
             conn.executescript(schema_sql)
+            self._migrate_order_items(conn)
+
+        # Logged after the with block so the connection is already back
+        # in the pool
+        logger.info(
+            "Database initialized at: %s (encryption: %s)",
+            self.db_path,
+            "ENABLED (SQLCipher)" if self.is_encrypted else "DISABLED (development mode)"
+        )
 
-        print(f"Database initialized at: {self.db_path}")
-        if self.is_encrypted:
-            print("Encryption: ENABLED (SQLCipher)")
-        else:
-            print("Encryption: DISABLED (development mode)")
+    @staticmethod
+    def _migrate_order_items(conn) -> None:
+        """
+        Move legacy orders.items JSON into order_items and drop the column.
+
+        A no-op once orders has no items column. Foreign keys are switched
+        off for the rebuild, otherwise dropping the old orders table would
+        cascade-delete the order_items rows just copied.
+
+        The column is only dropped once every order's items were copied. If
+        any order's items cannot be parsed or stored, the migration is
+        rolled back and the legacy column is left in place.
+
+        Args:
+            conn: Database connection (no transaction open)
+
+        Raises:
+            ValueError: If an order's items JSON cannot be converted
+            sqlite3.IntegrityError: If an item lacks a required field
+        """
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(orders)")}
+        if "items" not in columns:
+            return
+
+        conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            conn.execute("BEGIN")
+
+            order_count = 0
+            item_params = []
+            for row in conn.execute("SELECT order_id, items FROM orders"):
+                try:
+                    items = json.loads(row['items'])
+                    item_params.extend(
+                        (
+                            row['order_id'],
+                            idx,
+                            item.get('item_id'),
+                            item.get('product_id'),
+                            item.get('name'),
+                            item.get('quantity'),
+                            item.get('price'),
+                            item.get('unit'),
+                            item.get('brand')
+                        )
+                        for idx, item in enumerate(items)
+                    )
+                except (json.JSONDecodeError, TypeError, AttributeError) as e:
+                    raise ValueError(
+                        f"Cannot migrate items of order {row['order_id']}: {e}"
+                    ) from e
+                order_count += 1
+            conn.executemany(_SQL_INSERT_ORDER_ITEM, item_params)
+
+            conn.execute(_SQL_CREATE_ORDERS_REBUILD)
+            for statement in _SQL_ORDERS_REBUILD:
+                conn.execute(statement)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.execute("PRAGMA foreign_keys = ON")
+
+        logger.info(
+            "Moved %d legacy order items from %d orders into order_items",
+            len(item_params), order_count
+        )
 
     def verify_encryption(self) -> bool:
         """
@@ -163,14 +603,18 @@ class DatabaseManager:
     def execute_many(
         self,
         query: str,
-        params_list: List[Tuple]
+        params_list: Iterable[Tuple]
     ) -> int:
         """
         Execute a query multiple times with different parameters.
 
+        Any iterable is accepted, so large imports can stream rows without
+        building a list first, e.g.
+        ``db.execute_many(sql, (to_row(r) for r in source))``.
+
         Args:
             query: SQL query
-            params_list: List of parameter tuples
+            params_list: Iterable of parameter tuples
 
         Returns:
             Number of affected rows
@@ -179,7 +623,37 @@ class DatabaseManager:
             cursor = conn.executemany(query, params_list)
             return cursor.rowcount
 
-    def get_table_info(self, table_name: str) -> List[Dict[str, Any]]:
+    def execute_many_chunked(
+        self,
+        query: str,
+        params_list: Iterable[Tuple],
+        chunk: int = 10000
+    ) -> int:
+        """
+        Stream parameters into executemany, committing every `chunk` rows.
+
+        Each chunk is its own transaction, which bounds the WAL size and lets
+        it checkpoint during long imports. A failure rolls back only the
+        current chunk.
+
+        Args:
+            query: SQL query
+            params_list: Iterable of parameter tuples
+            chunk: Rows per transaction
+
+        Returns:
+            Number of affected rows
+        """
+        params_iter = iter(params_list)
+        total = 0
+
+        while True:
+            batch = list(islice(params_iter, chunk))
+            if not batch:
+                return total
+            total += self.execute_many(query, batch)
+
+    def get_table_info(self, table_name: str) -> List[ColumnInfo]:
         """
         Get column information for a table.
 
@@ -187,11 +661,26 @@ class DatabaseManager:
             table_name: Name of the table
 
         Returns:
-            List of column info dictionaries
+            List of ColumnInfo tuples
         """
-        query = f"PRAGMA table_info({table_name})"
-        rows = self.execute_query(query)
-        return [dict(row) for row in rows]
+        # Table-valued pragma binds the name, so one statement serves all tables
+        query = "SELECT cid, name, type, \"notnull\", dflt_value, pk FROM pragma_table_info(?)"
+        rows = self.execute_query(query, (table_name,))
+        return [ColumnInfo._make(row) for row in rows]
+
+    def get_column_names(self, table_name: str) -> Tuple[str, ...]:
+        """
+        Get the column names of a table.
+
+        Args:
+            table_name: Name of the table
+
+        Returns:
+            Column names in table order
+        """
+        query = "SELECT name FROM pragma_table_info(?)"
+        rows = self.execute_query(query, (table_name,))
+        return tuple(row[0] for row in rows)
 
     def table_exists(self, table_name: str) -> bool:
         """
@@ -212,7 +701,10 @@ class DatabaseManager:
 
     def get_row_count(self, table_name: str) -> int:
         """
-        Get the number of rows in a table.
+        Get the exact number of rows in a table.
+
+        This scans the whole table (O(N), and every page is decrypted under
+        SQLCipher); use get_row_count_estimate when an estimate is enough.
 
         Args:
             table_name: Name of the table
@@ -220,10 +712,63 @@ class DatabaseManager:
         Returns:
             Number of rows
         """
-        query = f"SELECT COUNT(*) as count FROM {table_name}"
+        query = 'SELECT COUNT(*) as count FROM "' + self._check_identifier(table_name) + '"'
         rows = self.execute_query(query)
         return rows[0]['count'] if rows else 0
 
+    @staticmethod
+    def _check_identifier(name: str) -> str:
+        """
+        Validate a table name before it is quoted into SQL.
+
+        Args:
+            name: Table name
+
+        Returns:
+            The name, unchanged
+
+        Raises:
+            ValueError: If the name is not a plain SQL identifier
+        """
+        if not _IDENTIFIER_RE.fullmatch(name):
+            raise ValueError(f"Invalid table name: {name!r}")
+        return name
+
+    def get_row_count_estimate(self, table_name: str) -> int:
+        """
+        Get an approximate row count from the query planner statistics.
+
+        Reads sqlite_stat1 (maintained by ANALYZE / PRAGMA optimize), which is
+        constant time. Falls back to the exact count when no statistics have
+        been gathered for the table yet.
+
+        Args:
+            table_name: Name of the table
+
+        Returns:
+            Estimated number of rows
+        """
+        if self.table_exists("sqlite_stat1"):
+            query = "SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1"
+            rows = self.execute_query(query, (table_name,))
+            if rows and rows[0]['stat']:
+                try:
+                    return int(rows[0]['stat'].split()[0])
+                except ValueError:
+                    pass
+
+        return self.get_row_count(table_name)
+
+    def optimize(self) -> None:
+        """
+        Force a full ANALYZE pass over all tables via PRAGMA optimize.
+
+        Meant for application shutdown and periodic maintenance; keeps the
+        query planner statistics (and get_row_count_estimate) fresh.
+        """
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA optimize = 0x10002")
+
     def vacuum(self) -> None:
         """
         Vacuum the database to reclaim space and optimize.
@@ -235,18 +780,63 @@ class DatabaseManager:
         """
         Create a backup of the database.
 
+        An encrypted backup is keyed the same way as the live database
+        (raw key, or the legacy passphrase settings), and is reopened with
+        that key afterwards to check that it can be read.
+
         Args:
             backup_path: Path for the backup file
+
+        Raises:
+            DatabaseError: If an encrypted backup cannot be opened with the key
         """
         with self.get_connection() as source:
             backup_conn = sqlcipher.connect(backup_path) if self.is_encrypted else sqlite3.connect(backup_path)
             if self.is_encrypted:
-                backup_conn.execute(f"PRAGMA key = '{self.encryption_key}'")
+                # The source connection has already settled which key the
+                # database uses
+                backup_conn = self._key_backup_connection(backup_conn)
+
+            # The target is a fresh file: durability during the copy is
+            # moot (a failed backup is simply retried), so skip fsyncs
+            # and keep the journal in memory
+            backup_conn.executescript(
+                "PRAGMA synchronous = OFF;"
+                " PRAGMA journal_mode = MEMORY;"
+                " PRAGMA cache_size = -131072;"
+            )
+
+            try:
+                # Large steps amortize the per-step decrypt/re-encrypt cost
+                source.backup(backup_conn, pages=_BACKUP_PAGES_PER_STEP)
+            finally:
+                backup_conn.close()
+
+        if self.is_encrypted:
+            check_conn = self._key_backup_connection(sqlcipher.connect(backup_path))
+            try:
+                check_conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            finally:
+                check_conn.close()
 
-            source.backup(backup_conn)
-            backup_conn.close()
+        logger.info("Database backed up to: %s", backup_path)
 
-        print(f"Database backed up to: {backup_path}")
+    def _key_backup_connection(self, conn):
+        """
+        Key a backup connection with the key the live database uses.
+
+        Args:
+            conn: Unkeyed SQLCipher connection
+
+        Returns:
+            Keyed connection
+        """
+        if self._legacy_key:
+            return self._key_connection_legacy(conn)
+
+        conn.execute(self._key_pragma)
+        conn.execute("PRAGMA cipher_page_size = 4096")
+        return conn
 
     # Order management methods
 
@@ -254,33 +844,53 @@ class DatabaseManager:
         """
         Create a new order in the database.
 
+        Callers importing many orders should use create_orders instead.
+
         Args:
             order: Order object to save
         """
-        query = """
-            INSERT INTO orders (
-                order_id, vendor, status, items, total_cost,
-                created_at, approved_at, placed_at, user_notes, auto_generated
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        self.create_orders([order])
+
+    def create_orders(self, orders: Iterable[Order]) -> int:
         """
+        Create several orders with one executemany in a single transaction.
 
-        # Serialize items to JSON
-        items_json = json.dumps([item.dict() for item in order.items])
+        Order rows and their order_items rows are written together.
 
-        params = (
-            order.order_id,
-            order.vendor.value if hasattr(order.vendor, 'value') else str(order.vendor),
-            order.status.value if hasattr(order.status, 'value') else str(order.status),
-            items_json,
-            order.total_cost,
-            order.created_at.isoformat() if order.created_at else None,
-            order.approved_at.isoformat() if order.approved_at else None,
-            order.placed_at.isoformat() if order.placed_at else None,
-            order.user_notes,
-            1 if order.auto_generated else 0
-        )
+        Args:
+            orders: Order objects to save
 
-        self.execute_update(query, params)
+        Returns:
+            Number of orders written
+        """
+        order_params = []
+        item_params = []
+
+        # vendor/status are usually enums, but callers may assign plain
+        # strings (e.g. vendors.OrderStatus constants), so read .value
+        # with a getattr default instead of probing with hasattr
+        for order in orders:
+            order_params.append((
+                order.order_id,
+                getattr(order.vendor, 'value', order.vendor),
+                getattr(order.status, 'value', order.status),
+                order.total_cost,
+                order.created_at.isoformat() if order.created_at else None,
+                order.approved_at.isoformat() if order.approved_at else None,
+                order.placed_at.isoformat() if order.placed_at else None,
+                order.user_notes,
+                1 if order.auto_generated else 0
+            ))
+            item_params.extend(self._order_item_params(order))
+
+        if not order_params:
+            return 0
+
+        with self.get_connection() as conn:
+            conn.executemany(_SQL_INSERT_ORDER, order_params)
+            conn.executemany(_SQL_INSERT_ORDER_ITEM, item_params)
+
+        return len(order_params)
 
     def get_order(self, order_id: str) -> Optional[Order]:
         """
@@ -292,41 +902,30 @@ class DatabaseManager:
         Returns:
             Order object or None if not found
         """
-        query = """
-            SELECT order_id, vendor, status, items, total_cost,
-                   created_at, approved_at, placed_at, user_notes, auto_generated
-            FROM orders
-            WHERE order_id = ?
-        """
-
-        rows = self.execute_query(query, (order_id,))
-
-        if not rows:
-            return None
+        # order_id is the primary key, so this is a single index lookup;
+        # the remaining rows are one per order item
+        with self.get_connection() as conn:
+            cursor = conn.execute(_SQL_SELECT_ORDER, (order_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            rows = [row]
+            rows.extend(cursor)
 
-        return self._row_to_order(rows[0])
+        return self._rows_to_order(rows)
 
     def update_order(self, order: Order) -> None:
         """
         Update an existing order.
 
+        The order's items are replaced in the same transaction.
+
         Args:
             order: Order object with updated values
         """
-        query = """
-            UPDATE orders
-            SET vendor = ?, status = ?, items = ?, total_cost = ?,
-                approved_at = ?, placed_at = ?, user_notes = ?
-            WHERE order_id = ?
-        """
-
-        # Serialize items to JSON
-        items_json = json.dumps([item.dict() for item in order.items])
-
         params = (
-            order.vendor.value if hasattr(order.vendor, 'value') else str(order.vendor),
-            order.status.value if hasattr(order.status, 'value') else str(order.status),
-            items_json,
+            getattr(order.vendor, 'value', order.vendor),
+            getattr(order.status, 'value', order.status),
             order.total_cost,
             order.approved_at.isoformat() if order.approved_at else None,
             order.placed_at.isoformat() if order.placed_at else None,
@@ -334,7 +933,10 @@ class DatabaseManager:
             order.order_id
         )
 
-        self.execute_update(query, params)
+        with self.get_connection() as conn:
+            conn.execute(_SQL_UPDATE_ORDER, params)
+            conn.execute(_SQL_DELETE_ORDER_ITEMS, (order.order_id,))
+            conn.executemany(_SQL_INSERT_ORDER_ITEM, self._order_item_params(order))
 
     def get_all_orders(self) -> List[Order]:
         """
@@ -343,49 +945,105 @@ class DatabaseManager:
         Returns:
             List of Order objects
         """
-        query = """
-            SELECT order_id, vendor, status, items, total_cost,
-                   created_at, approved_at, placed_at, user_notes, auto_generated
-            FROM orders
-            ORDER BY created_at DESC
+        return list(self.iter_orders())
+
+    def iter_orders(self, batch_size: int = _FETCH_BATCH_SIZE) -> Iterator[Order]:
         """
+        Stream orders from the database, newest first.
 
-        rows = self.execute_query(query)
-        return [self._row_to_order(row) for row in rows]
+        Rows are fetched in batches, so callers that only need a prefix of
+        the history don't pay for converting the whole table.
+
+        Args:
+            batch_size: Rows fetched per round-trip
+
+        Yields:
+            Order objects
+        """
+        with self.get_connection() as conn:
+            cursor = conn.execute(_SQL_SELECT_ALL_ORDERS)
+
+            def rows():
+                while True:
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        return
+                    yield from batch
 
-    def _row_to_order(self, row: sqlite3.Row) -> Order:
+            for _, order_rows in groupby(rows(), key=itemgetter('order_id')):
+                yield self._rows_to_order(list(order_rows))
+
+    @staticmethod
+    def _order_item_params(order: Order) -> List[Tuple]:
         """
-        Convert a database row to an Order object.
+        Build order_items insert parameters for an order.
 
         Args:
-            row: Database row
+            order: Order object
 
         Returns:
-            Order object
+            List of parameter tuples, one per item
         """
-        # Parse items from JSON
-        items_data = json.loads(row['items'])
-
-        # Parse dates
-        created_at = datetime.fromisoformat(row['created_at']) if row['created_at'] else datetime.now()
-        approved_at = datetime.fromisoformat(row['approved_at']) if row['approved_at'] else None
-        placed_at = datetime.fromisoformat(row['placed_at']) if row['placed_at'] else None
-
-        # Create Order object - items will be validated by Pydantic
-        order = Order(
-            order_id=row['order_id'],
-            vendor=row['vendor'],
-            status=row['status'],
-            items=items_data,  # Pydantic will convert these dicts to OrderItem objects
-            total_cost=row['total_cost'],
-            created_at=created_at,
-            approved_at=approved_at,
-            placed_at=placed_at,
-            user_notes=row['user_notes'],
-            auto_generated=bool(row['auto_generated'])
-        )
+        return [
+            (
+                order.order_id,
+                idx,
+                item.item_id,
+                item.product_id,
+                item.name,
+                item.quantity,
+                item.price,
+                item.unit,
+                item.brand
+            )
+            for idx, item in enumerate(order.items)
+        ]
+
+    def _rows_to_order(self, rows: List[sqlite3.Row]) -> Order:
+        """
+        Convert the joined rows of one order to an Order object.
 
-        return order
+        Args:
+            rows: Database rows for a single order, one per item
+
+        Returns:
+            Order object
+        """
+        row = rows[0]
+
+        items = [
+            OrderItem.model_construct(
+                item_id=item_row['item_id'],
+                product_id=item_row['product_id'],
+                name=item_row['name'],
+                quantity=item_row['quantity'],
+                price=item_row['price'],
+                unit=item_row['unit'],
+                brand=item_row['brand']
+            )
+            for item_row in rows
+            if item_row['item_id'] is not None
+        ]
+
+        # Timestamps arrive already parsed by the column converter
+        fields = {
+            'order_id': row['order_id'],
+            'vendor': Vendor(row['vendor']),
+            'status': OrderStatus(row['status']),
+            'items': items,
+            'total_cost': row['total_cost'],
+            'approved_at': row['approved_at'],
+            'placed_at': row['placed_at'],
+            'user_notes': row['user_notes'],
+            'auto_generated': bool(row['auto_generated'])
+        }
+        # A NULL created_at is left out so the model's default_factory
+        # fills it in at construction
+        if row['created_at'] is not None:
+            fields['created_at'] = row['created_at']
+
+        # Rows were validated when written, so skip Pydantic validation
+        return Order.model_construct(**fields)
 
     def get_preferences(self) -> Dict[str, Any]:
         """
@@ -404,7 +1062,6 @@ class DatabaseManager:
 
             # Try to parse JSON values
             try:
-                import json
                 preferences[key] = json.loads(value_str)
             except (json.JSONDecodeError, TypeError):
                 # If not JSON, store as string
@@ -420,8 +1077,6 @@ class DatabaseManager:
             key: Preference key
             value: Preference value (will be JSON-serialized)
         """
-        import json
-
         # Serialize value to JSON
         value_str = json.dumps(value) if not isinstance(value, str) else value
 
@@ -442,10 +1097,17 @@ class DatabaseManager:
         """
         Close the database manager.
 
-        Note: Connections are managed per-transaction, so this is mainly
-        for cleanup and future resource management.
+        Closes all idle pooled connections. The manager stays usable; new
+        connections are opened on demand.
         """
-        pass
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            self._close_connection(conn)
+            with self._pool_lock:
+                self._pool_created -= 1
 
 
 def create_database_manager(
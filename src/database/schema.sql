@@ -62,7 +62,6 @@ CREATE TABLE IF NOT EXISTS orders (
     order_id TEXT PRIMARY KEY,
     vendor TEXT NOT NULL,  -- 'amazon', 'walmart'
     status TEXT NOT NULL,  -- 'pending_approval', 'approved', 'placed', 'delivered', 'cancelled'
-    items TEXT NOT NULL,  -- JSON array of {item_id, quantity, price, product_id}
     total_cost REAL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     approved_at DATETIME,
@@ -77,6 +76,23 @@ CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
 CREATE INDEX IF NOT EXISTS idx_orders_vendor ON orders(vendor);
 CREATE INDEX IF NOT EXISTS idx_orders_created ON orders(created_at);
 
+-- Order items - one row per line item (primary key covers lookups by order_id)
+CREATE TABLE IF NOT EXISTS order_items (
+    order_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,  -- Position of the item within the order
+    item_id TEXT NOT NULL,  -- Reference to inventory item
+    product_id TEXT,  -- Vendor's product ID
+    name TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    price REAL NOT NULL,
+    unit TEXT,
+    brand TEXT,
+    PRIMARY KEY (order_id, idx),
+    FOREIGN KEY (order_id) REFERENCES orders(order_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_order_items_item ON order_items(item_id);
+
 -- User preferences - configuration and settings
 CREATE TABLE IF NOT EXISTS preferences (
     key TEXT PRIMARY KEY,
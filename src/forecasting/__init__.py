@@ -5,7 +5,7 @@ This module implements the forecasting engine using PyTorch-based state space mo
 with online learning capabilities.
 """
 
-from src.forecasting.state_space_model import ConsumptionForecaster
+from src.forecasting.state_space_model import BatchForecaster, ConsumptionForecaster
 from src.forecasting.online_trainer import OnlineForecastTrainer
 
-__all__ = ["ConsumptionForecaster", "OnlineForecastTrainer"]
+__all__ = ["BatchForecaster", "ConsumptionForecaster", "OnlineForecastTrainer"]
@@ -7,16 +7,110 @@ Implements continuous model updates with new observations using:
 - Periodic full retraining with historical data
 """
 
-import torch
-from typing import Dict, List, Tuple, Optional, Any
+import functools
+import json
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-import json
+from typing import Any, Dict, List, Optional, Tuple
 
-from src.forecasting.state_space_model import ConsumptionForecaster, extract_features
+import numpy as np
+import torch
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from src.forecasting.state_space_model import (
+    BatchForecaster,
+    ConsumptionForecaster,
+    extract_features,
+    extract_features_batch,
+)
 from src.models.inventory import InventoryItem
 from src.utils.logger import get_logger
 
+# Observation history entry: (quantity, timestamp)
+_OBSERVATION_DTYPE = np.dtype([("value", np.float32), ("time", "datetime64[s]")])
+
+# Sharded checkpoint: every item's model in one file, metadata in another
+_SHARD_CHECKPOINT = "models.pt"
+_SHARD_METADATA = "meta.json"
+
+
+@functools.lru_cache(maxsize=32)
+def _read_checkpoint(path: str) -> Dict[str, Any]:
+    """
+    Read a pre-trained checkpoint once per path.
+
+    The returned dict is shared between callers and must not be mutated;
+    copy tensors out of it before loading them into a model.
+    """
+    # mmap pages tensor data in on access instead of copying it all up front
+    return torch.load(path, map_location="cpu", weights_only=True, mmap=True)
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """
+    Write compact JSON with a single write, then atomically replace path.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable dictionary
+    """
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data)
+    else:
+        payload = json.dumps(data, separators=(",", ":")).encode()
+
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+class _RingBuffer:
+    """
+    Fixed-capacity FIFO backed by a preallocated NumPy array.
+
+    Once full, each append overwrites the oldest entry, so memory per item
+    stays bounded no matter how many observations arrive.
+    """
+
+    def __init__(self, capacity: int, dtype: Any):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.head = 0
+        self.count = 0
+        self.total = 0  # Values ever appended, including overwritten ones
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, value: Any) -> None:
+        """Append a value, overwriting the oldest one when full."""
+        capacity = len(self.data)
+        self.data[self.head] = value
+        self.head = (self.head + 1) % capacity
+        self.count = min(self.count + 1, capacity)
+        self.total += 1
+
+    def extend(self, values: Any) -> None:
+        """Append several values in order."""
+        for value in values:
+            self.append(value)
+
+    def values(self) -> np.ndarray:
+        """Return the stored values, oldest first."""
+        capacity = len(self.data)
+        if self.count < capacity:
+            return self.data[:self.count]
+        return np.take(self.data, (self.head + np.arange(capacity)) % capacity)
+
 
 class OnlineForecastTrainer:
     """
@@ -35,6 +129,8 @@ class OnlineForecastTrainer:
         ewma_alpha: float = 0.3,
         retrain_interval_days: int = 7,
         pretrained_dir: Optional[Path] = None,
+        history_cap: int = 2048,
+        use_compile: bool = False,
     ):
         """
         Initialize the online trainer.
@@ -44,12 +140,17 @@ class OnlineForecastTrainer:
             ewma_alpha: Exponential weighted moving average coefficient (0-1)
             retrain_interval_days: Days between full retraining
             pretrained_dir: Directory with pre-trained models (defaults to models/pretrained)
+            history_cap: Observations and errors kept per item (oldest are dropped)
+            use_compile: Run forecast rollouts through torch.compile
         """
         self.model_dir = Path(model_dir)
         self.model_dir.mkdir(parents=True, exist_ok=True)
 
         self.ewma_alpha = ewma_alpha
+        self._ewma_decay = 1.0 - ewma_alpha
         self.retrain_interval_days = retrain_interval_days
+        self.history_cap = history_cap
+        self._use_compile = use_compile
 
         # Pre-trained models directory
         if pretrained_dir is None:
@@ -59,21 +160,37 @@ class OnlineForecastTrainer:
         # Model registry: item_id -> (model, state, last_trained, performance)
         self.models: Dict[str, Dict[str, Any]] = {}
 
+        # Per-item locks for concurrent training in train_all_models
+        self._item_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._item_locks_guard = threading.Lock()
+
         self.logger = get_logger("online_trainer")
 
-        # Log pre-trained models availability
+        # Index pre-trained models once: lowercased category token -> path
+        # (e.g. pretrained_Fresh_Produce.pt is found under "fresh", "produce"
+        # and "fresh_produce"), with the first model as a fallback
+        self._pretrained_index: Dict[str, Path] = {}
+        self._pretrained_fallback: Optional[Path] = None
+
         if self.pretrained_dir.exists():
-            pretrained_count = len(list(self.pretrained_dir.glob("pretrained_*.pt")))
-            if pretrained_count > 0:
+            paths = sorted(self.pretrained_dir.glob("pretrained_*.pt"))
+            for path in paths:
+                name = path.stem[len("pretrained_"):].lower()
+                for token in [name, *name.split("_")]:
+                    self._pretrained_index.setdefault(token, path)
+
+            if paths:
+                self._pretrained_fallback = paths[0]
                 self.logger.info(
-                    f"Found {pretrained_count} pre-trained models in {self.pretrained_dir}"
+                    f"Found {len(paths)} pre-trained models in {self.pretrained_dir}"
                 )
 
     def _load_pretrained_model(self, category: str) -> Optional[ConsumptionForecaster]:
         """
         Load a pre-trained model for a category.
 
-        Uses flexible matching to find the best pre-trained model.
+        Matches the category against the index built at startup, falling
+        back to any pre-trained model.
 
         Args:
             category: Item category (Dairy, Produce, Protein, etc.)
@@ -81,38 +198,25 @@ class OnlineForecastTrainer:
         Returns:
             Pre-trained model or None if not found
         """
-        if not self.pretrained_dir.exists():
+        best_path = self._pretrained_index.get(category.lower(), self._pretrained_fallback)
+        if best_path is None:
             return None
 
-        # Flexible matching - find all candidates
-        candidates = list(self.pretrained_dir.glob(f"*_{category}*.pt"))
-        if not candidates:
-            # Fallback to broad search if exact category missing
-            candidates = list(self.pretrained_dir.glob("pretrained_*.pt"))
-
-        if not candidates:
-            return None
-
-        # Prefer exact match
-        best_path = candidates[0]
-        for path in candidates:
-            if category.lower() in path.name.lower():
-                best_path = path
-                break
-
         try:
-            checkpoint = torch.load(best_path, map_location="cpu")
-
-            # Create model and load state
-            model = ConsumptionForecaster(
+            # Cached per path; from_state_dict clones the weights, so models
+            # never share storage with the cache or each other
+            checkpoint = _read_checkpoint(str(best_path))
+
+            # Create model straight from the weights (no random init)
+            model = ConsumptionForecaster.from_state_dict(
+                checkpoint["model_state_dict"],
+                checkpoint["state_cov"],
                 state_dim=4,
                 feature_dim=8,
                 process_noise_std=0.1,
                 obs_noise_std=0.05,
                 learning_rate=0.001,
             )
-            model.load_state_dict(checkpoint["model_state_dict"])
-            model.state_cov = checkpoint["state_cov"]
 
             self.logger.info(
                 f"Loaded pre-trained model for category '{category}' from {best_path.name}"
@@ -149,7 +253,7 @@ class OnlineForecastTrainer:
         model = None
         used_pretrained = False
 
-        if category and self.pretrained_dir.exists():
+        if category and self._pretrained_fallback is not None:
             model = self._load_pretrained_model(category)
             if model:
                 used_pretrained = True
@@ -170,15 +274,19 @@ class OnlineForecastTrainer:
         state = model.initialize_state(current_quantity, recent_observations)
 
         # Register model
+        now = datetime.now()
         self.models[item_id] = {
             "model": model,
             "state": state,
-            "last_trained": datetime.now(),
-            "last_retrained": datetime.now(),
-            "observations": [],
-            "errors": [],
+            "last_trained": now,
+            "last_retrained": now,
+            "last_retrained_ts": now.timestamp(),
+            "observations": _RingBuffer(self.history_cap, _OBSERVATION_DTYPE),
+            "errors": _RingBuffer(self.history_cap, np.float32),
             "pretrained": used_pretrained,
-            "prev_qty": current_quantity,  # Track previous quantity for restock detection
+            # Previous quantity for restock detection, kept on the state's device
+            "prev_qty": torch.tensor(float(current_quantity), device=state.device),
+            **self._init_error_stats([]),
         }
 
         if used_pretrained:
@@ -218,12 +326,17 @@ class OnlineForecastTrainer:
         # Get or create model
         model, state = self.get_or_create_model(item_id, item_data)
 
-        # Get previous quantity for restock detection
-        prev_qty = self.models[item_id].get("prev_qty", state[0].item())
+        # Get previous quantity for restock detection (a 0-dim tensor on the
+        # state's device, so the comparison below runs there)
+        prev_qty = self.models[item_id].get("prev_qty")
+        if prev_qty is None:
+            prev_qty = state[0]
+        observation_t = torch.tensor(float(observation), device=state.device)
 
         # RESTOCK DETECTION LOGIC
-        # Inventory increasing = restocking event (not natural consumption)
-        is_restock = observation > (prev_qty + 0.05)  # Small buffer for noise
+        # Inventory increasing = restocking event (not natural consumption).
+        # Control flow differs per branch, so this is the one host sync.
+        is_restock = bool(observation_t > prev_qty + 0.05)  # Small buffer for noise
 
         # Extract features
         features = extract_features(item_data, timestamp)
@@ -231,8 +344,8 @@ class OnlineForecastTrainer:
         if is_restock:
             # Restocking event - don't learn, just reset state
             self.logger.info(
-                f"Restock detected for {item_id} ({prev_qty:.2f} -> {observation:.2f}). "
-                f"Resetting state without learning."
+                "Restock detected for %s (%.2f -> %.2f). Resetting state without learning.",
+                item_id, float(prev_qty), observation,
             )
             updated_state = model.handle_restock(state, observation)
             prediction_error = 0.0
@@ -245,34 +358,142 @@ class OnlineForecastTrainer:
                 perform_learning=True,
             )
 
+        return self._record_update(
+            item_id,
+            item_data,
+            timestamp,
+            observation_t,
+            updated_state,
+            prediction_error,
+            is_restock,
+        )
+
+    def update_models_batch(
+        self,
+        updates: List[Tuple[str, float, Dict[str, Any], Optional[datetime]]],
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Update many item models with one observation each in a batched step.
+
+        Equivalent to calling update_model for each entry, but the Kalman
+        step for all items runs as one BatchForecaster update. Repeated
+        item_ids are applied in order across successive batches.
+
+        Args:
+            updates: (item_id, observation, item_data, timestamp) tuples;
+                timestamp may be None for now
+
+        Returns:
+            Dictionary of item_id -> update metrics (last update per item)
+        """
+        results = {}
+        pending = list(updates)
+
+        while pending:
+            # First occurrence of each item this round, the rest next round
+            batch, seen, deferred = [], set(), []
+            for update in pending:
+                if update[0] in seen:
+                    deferred.append(update)
+                else:
+                    seen.add(update[0])
+                    batch.append(update)
+            pending = deferred
+
+            now = datetime.now()
+            models, states, prev_qtys, features = [], [], [], []
+            for item_id, _observation, item_data, timestamp in batch:
+                model, state = self.get_or_create_model(item_id, item_data)
+                prev_qty = self.models[item_id].get("prev_qty")
+                models.append(model)
+                states.append(state)
+                prev_qtys.append(state[0] if prev_qty is None else prev_qty)
+                features.append(extract_features(item_data, timestamp or now))
+
+            observations = torch.tensor([float(u[1]) for u in batch])
+            prev_qtys = torch.stack(prev_qtys)
+
+            # RESTOCK DETECTION LOGIC, vectorized (see update_model)
+            restock_mask = observations > prev_qtys + 0.05
+
+            updated_states, errors = BatchForecaster(models).update(
+                torch.stack(states),
+                observations,
+                torch.stack(features),
+                restock_mask=restock_mask,
+            )
+
+            restocks = restock_mask.tolist()
+            error_values = errors.tolist()
+            for i, (item_id, observation, item_data, timestamp) in enumerate(batch):
+                if restocks[i]:
+                    self.logger.info(
+                        "Restock detected for %s (%.2f -> %.2f). Resetting state without learning.",
+                        item_id, float(prev_qtys[i]), observation,
+                    )
+                results[item_id] = self._record_update(
+                    item_id,
+                    item_data,
+                    timestamp or now,
+                    observations[i],
+                    updated_states[i],
+                    error_values[i],
+                    restocks[i],
+                )
+
+        return results
+
+    def _record_update(
+        self,
+        item_id: str,
+        item_data: Dict[str, Any],
+        timestamp: datetime,
+        observation_t: torch.Tensor,
+        updated_state: torch.Tensor,
+        prediction_error: float,
+        is_restock: bool,
+    ) -> Dict[str, float]:
+        """
+        Store the outcome of one observation in the registry.
+
+        Updates state, history and error statistics, and triggers a full
+        retrain when the retrain interval has passed.
+
+        Returns:
+            Dictionary with prediction error and updated metrics
+        """
+        info = self.models[item_id]
+        model = info["model"]
+        observation = float(observation_t)
+
         # Update registry
-        self.models[item_id]["state"] = updated_state
-        self.models[item_id]["prev_qty"] = observation  # Track for next comparison
-        self.models[item_id]["last_trained"] = timestamp
-        self.models[item_id]["observations"].append((observation, timestamp))
+        info["state"] = updated_state
+        info["prev_qty"] = observation_t  # Track for next comparison
+        info["last_trained"] = timestamp
+        info["observations"].append(
+            (observation, np.datetime64(timestamp, "s"))
+        )
 
         # Only track errors for consumption events (not restocks)
         if not is_restock:
-            self.models[item_id]["errors"].append(prediction_error)
+            info["errors"].append(prediction_error)
+            self._update_error_stats(info, prediction_error)
 
-        # Compute EWMA of error for tracking
-        errors = self.models[item_id]["errors"]
-        if len(errors) > 1:
-            ewma_error = self._compute_ewma(errors)
-            mae = sum(abs(e) for e in errors) / len(errors)
-        else:
-            ewma_error = abs(prediction_error)
-            mae = abs(prediction_error)
+        # Running statistics keep this O(1) regardless of history length
+        ewma_error = info["ewma_error"]
+        mae = info["abs_sum"] / info["err_count"] if info["err_count"] else 0.0
 
-        # Check if full retraining is needed
-        days_since_retrain = (timestamp - self.models[item_id]["last_retrained"]).days
-        if days_since_retrain >= self.retrain_interval_days:
+        # Check if full retraining is needed (epoch seconds avoid building a
+        # timedelta per observation)
+        seconds_since_retrain = timestamp.timestamp() - info["last_retrained_ts"]
+        if seconds_since_retrain >= self.retrain_interval_days * 86400:
             self.logger.info(f"Triggering full retraining for item {item_id}")
             self._retrain_from_scratch(item_id, item_data)
 
+        # Lazy %-formatting: nothing is formatted unless debug is enabled
         self.logger.debug(
-            f"Updated model for {item_id}: error={prediction_error:.3f}, "
-            f"EWMA error={ewma_error:.3f}, MAE={mae:.3f}"
+            "Updated model for %s: error=%.3f, EWMA error=%.3f, MAE=%.3f",
+            item_id, prediction_error, ewma_error, mae,
         )
 
         return {
@@ -283,15 +504,71 @@ class OnlineForecastTrainer:
         }
 
     def _compute_ewma(self, values: List[float]) -> float:
-        """Compute exponential weighted moving average."""
-        if not values:
+        """
+        Compute exponential weighted moving average.
+
+        Uses the closed form of the recurrence
+        s_i = alpha * x_i + (1 - alpha) * s_{i-1}, s_0 = x_0,
+        so the whole sum is a single dot product.
+        """
+        if len(values) == 0:
             return 0.0
 
-        ewma = values[0]
-        for value in values[1:]:
-            ewma = self.ewma_alpha * value + (1 - self.ewma_alpha) * ewma
+        values = np.asarray(values, dtype=np.float64)
+        decay = self._ewma_decay
+        n = len(values)
+
+        # x_i (i >= 1) is weighted alpha * decay^(n-1-i); x_0 keeps decay^(n-1)
+        weights = self.ewma_alpha * decay ** np.arange(n - 2, -1, -1)
+        return float(np.dot(weights, values[1:]) + decay ** (n - 1) * values[0])
+
+    def _init_error_stats(self, errors: List[float]) -> Dict[str, Any]:
+        """
+        Build running error statistics from a list of prediction errors.
+
+        Args:
+            errors: Prediction errors (signed)
+
+        Returns:
+            Dictionary with ewma_error, abs_sum, sq_sum and err_count
+        """
+        errors = np.asarray(errors, dtype=np.float64)
+        abs_errors = np.abs(errors)
+        return {
+            "ewma_error": self._compute_ewma(abs_errors),
+            "abs_sum": float(abs_errors.sum()),
+            "sq_sum": float(np.dot(errors, errors)),
+            "err_count": len(errors),
+        }
+
+    def _update_error_stats(self, model_info: Dict[str, Any], error: float) -> None:
+        """
+        Fold one prediction error into the running statistics in O(1).
 
-        return ewma
+        Args:
+            model_info: Model registry entry
+            error: Prediction error (signed)
+        """
+        abs_err = abs(error)
+        if model_info["err_count"] == 0:
+            model_info["ewma_error"] = abs_err
+        else:
+            model_info["ewma_error"] = (
+                self.ewma_alpha * abs_err
+                + self._ewma_decay * model_info["ewma_error"]
+            )
+        model_info["abs_sum"] += abs_err
+        model_info["sq_sum"] += error * error
+        model_info["err_count"] += 1
+
+    @staticmethod
+    def _feature_key(item_data: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Item fields that extract_features reads (besides the date)."""
+        return (
+            item_data.get("household_size", 2),
+            item_data.get("perishable", False),
+            str(item_data.get("expiry_date")),
+        )
 
     def _retrain_from_scratch(
         self,
@@ -307,12 +584,21 @@ class OnlineForecastTrainer:
             return
 
         model_info = self.models[item_id]
-        observations = model_info["observations"]
 
-        if len(observations) < 5:
+        if len(model_info["observations"]) < 5:
             self.logger.info(f"Insufficient data for retraining {item_id}")
             return
 
+        # Nothing new since the last retrain (same history, same feature
+        # inputs) means the replay would reproduce the current model
+        history_key = (model_info["observations"].total, self._feature_key(item_data))
+        if model_info.get("last_retrained_key") == history_key:
+            self.logger.debug("No new observations for %s since last retrain, skipping", item_id)
+            return
+
+        history = model_info["observations"].values()
+        observations = list(zip(history["value"].tolist(), history["time"].tolist(), strict=True))
+
         # Create fresh model
         new_model = ConsumptionForecaster(
             state_dim=4,
@@ -327,25 +613,54 @@ class OnlineForecastTrainer:
         recent_obs = observations[:min(10, len(observations))]
         state = new_model.initialize_state(initial_quantity, recent_obs)
 
-        # Train on full history
-        total_loss = 0.0
-        for obs_value, obs_time in observations:
-            features = extract_features(item_data, obs_time)
-            state, error = new_model.update(state, obs_value, features, perform_learning=True)
-            total_loss += error**2
+        # Train on full history; update_batch learns chunk by chunk so the
+        # replay moves the weights about as far as per-observation updates
+        features_sequence = extract_features_batch(item_data, history["time"])
+        obs_tensor = torch.from_numpy(history["value"].astype(np.float32))
+        state, errors = new_model.update_batch(state, obs_tensor, features_sequence)
 
-        avg_loss = total_loss / len(observations)
+        avg_loss = float((errors**2).mean())
 
         # Replace old model with retrained version
         self.models[item_id]["model"] = new_model
         self.models[item_id]["state"] = state
-        self.models[item_id]["last_retrained"] = datetime.now()
+        now = datetime.now()
+        self.models[item_id]["last_retrained"] = now
+        self.models[item_id]["last_retrained_ts"] = now.timestamp()
+        self.models[item_id]["last_retrained_key"] = history_key
 
         self.logger.info(
             f"Retrained model for {item_id} on {len(observations)} observations. "
             f"Avg loss: {avg_loss:.4f}"
         )
 
+    def _trajectory_fn(self, model: ConsumptionForecaster):
+        """
+        Get the trajectory rollout function for a model.
+
+        With use_compile, the model's predict_trajectory is compiled once
+        (reduce-overhead mode, static shapes since n_days is fixed per call
+        site) and reused; otherwise the eager method is returned.
+        """
+        if not self._use_compile:
+            return model.predict_trajectory
+
+        compiled = getattr(model, "_compiled_trajectory", None)
+        if compiled is None:
+            try:
+                compiled = torch.compile(
+                    model.predict_trajectory,
+                    mode="reduce-overhead",
+                    dynamic=False,
+                )
+            except Exception as e:
+                self.logger.warning(f"torch.compile unavailable, using eager forecasts: {e}")
+                self._use_compile = False
+                return model.predict_trajectory
+            model._compiled_trajectory = compiled
+
+        return compiled
+
     def generate_forecast(
         self,
         item_id: str,
@@ -370,24 +685,23 @@ class OnlineForecastTrainer:
         # Ensure state matches current database quantity
         # (handles case where DB was updated but model state wasn't)
         current_qty = float(item_data.get("quantity_current", 0.0))
-        if abs(state[0].item() - current_qty) > 0.1:
+        state_qty = state[0].item()
+        if abs(state_qty - current_qty) > 0.1:
             self.logger.debug(
-                f"State quantity mismatch for {item_id}: "
-                f"state={state[0].item():.2f}, db={current_qty:.2f}. Resetting."
+                "State quantity mismatch for %s: state=%.2f, db=%.2f. Resetting.",
+                item_id, state_qty, current_qty,
             )
             state = model.handle_restock(state, current_qty)
             self.models[item_id]["state"] = state
-            self.models[item_id]["prev_qty"] = current_qty
+            self.models[item_id]["prev_qty"] = torch.tensor(current_qty, device=state.device)
 
         # Generate feature sequence for future dates
         current_date = datetime.now()
         future_dates = [current_date + timedelta(days=i) for i in range(1, n_days + 1)]
-        features_sequence = torch.stack([
-            extract_features(item_data, date) for date in future_dates
-        ])
+        features_sequence = extract_features_batch(item_data, future_dates)
 
         # Predict trajectory
-        states, quantities, uncertainties = model.predict_trajectory(
+        states, quantities, uncertainties = self._trajectory_fn(model)(
             state,
             features_sequence,
             n_steps=n_days,
@@ -400,13 +714,13 @@ class OnlineForecastTrainer:
             confidence,
         )
 
-        # Predict runout date
+        # Predict runout date from the same trajectory (predict_runout_date
+        # with max_days=n_days would roll it out again)
         threshold = item_data.get("quantity_min", 0.0)
-        days_until_runout, runout_confidence = model.predict_runout_date(
-            state,
-            features_sequence,
+        days_until_runout, runout_confidence = model.runout_from_trajectory(
+            quantities,
+            uncertainties,
             threshold=threshold,
-            max_days=n_days,
         )
 
         # Prepare forecast result
@@ -436,78 +750,138 @@ class OnlineForecastTrainer:
         }
 
         # Add performance metrics if available
-        if item_id in self.models and self.models[item_id]["errors"]:
-            errors = self.models[item_id]["errors"]
-            forecast["performance"] = {
-                "mae": sum(abs(e) for e in errors) / len(errors),
-                "rmse": (sum(e**2 for e in errors) / len(errors))**0.5,
-                "n_observations": len(self.models[item_id]["observations"]),
-            }
+        performance = self.get_model_performance(item_id)
+        if performance is not None:
+            del performance["ewma_error"]
+            forecast["performance"] = performance
 
         return forecast
 
+    def _model_metadata(self, model_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the JSON metadata saved alongside a model."""
+        return {
+            "last_trained": model_info["last_trained"].isoformat(),
+            "last_retrained": model_info["last_retrained"].isoformat(),
+            "n_observations": len(model_info["observations"]),
+            "recent_errors": model_info["errors"].values()[-10:].tolist(),  # Last 10 errors
+            "error_stats": {
+                "ewma_error": model_info["ewma_error"],
+                "abs_sum": model_info["abs_sum"],
+                "sq_sum": model_info["sq_sum"],
+                "err_count": model_info["err_count"],
+            },
+        }
+
     def save_all_models(self) -> None:
-        """Save all models to disk."""
-        for item_id, model_info in self.models.items():
-            model_path = self.model_dir / f"{item_id}.pt"
-            model_info["model"].save_checkpoint(str(model_path))
+        """
+        Save all models to disk.
 
-            # Save metadata separately
-            metadata_path = self.model_dir / f"{item_id}_meta.json"
-            metadata = {
-                "last_trained": model_info["last_trained"].isoformat(),
-                "last_retrained": model_info["last_retrained"].isoformat(),
-                "n_observations": len(model_info["observations"]),
-                "recent_errors": model_info["errors"][-10:],  # Last 10 errors
+        All models go into a single checkpoint (models.pt) and all metadata
+        into a single meta.json, instead of two files per item.
+        """
+        checkpoints = {}
+        metadata = {}
+        for item_id, model_info in self.models.items():
+            checkpoints[item_id] = {
+                **model_info["model"].to_checkpoint(),
+                "state": model_info["state"].detach().cpu(),
             }
+            metadata[item_id] = self._model_metadata(model_info)
+
+        # Write-then-replace so a crash never leaves a truncated checkpoint
+        checkpoint_path = self.model_dir / _SHARD_CHECKPOINT
+        tmp_path = checkpoint_path.with_suffix(".pt.tmp")
+        torch.save(checkpoints, tmp_path)
+        os.replace(tmp_path, checkpoint_path)
 
-            with open(metadata_path, "w") as f:
-                json.dump(metadata, f, indent=2)
+        _write_json_atomic(self.model_dir / _SHARD_METADATA, metadata)
 
         self.logger.info(f"Saved {len(self.models)} models to {self.model_dir}")
 
-    def load_model(self, item_id: str) -> bool:
+    def _register_loaded_model(
+        self,
+        item_id: str,
+        model: ConsumptionForecaster,
+        metadata: Dict[str, Any],
+        state: Optional[torch.Tensor] = None,
+    ) -> None:
         """
-        Load a model from disk.
+        Register a model restored from disk.
+
+        Args:
+            item_id: Unique item identifier
+            model: Restored model
+            metadata: Saved metadata (may be empty)
+            state: Saved state; zeros if unknown (updated with next observation)
+        """
+        if state is None:
+            state = torch.zeros(model.state_dim)
+        else:
+            state = state.to(torch.float32, copy=True)
+
+        # Older metadata has no running statistics; rebuild them from
+        # the recent errors it does keep
+        recent_errors = metadata.get("recent_errors", [])
+        error_stats = metadata.get("error_stats") or self._init_error_stats(recent_errors)
+        errors = _RingBuffer(self.history_cap, np.float32)
+        errors.extend(recent_errors)
+
+        now = datetime.now()
+        last_trained = metadata.get("last_trained")
+        last_retrained = metadata.get("last_retrained")
+        last_trained = datetime.fromisoformat(last_trained) if last_trained else now
+        last_retrained = datetime.fromisoformat(last_retrained) if last_retrained else now
+
+        self.models[item_id] = {
+            "model": model,
+            "state": state,
+            "last_trained": last_trained,
+            "last_retrained": last_retrained,
+            "last_retrained_ts": last_retrained.timestamp(),
+            "observations": _RingBuffer(self.history_cap, _OBSERVATION_DTYPE),
+            "errors": errors,
+            "prev_qty": state[0].clone(),  # Initialize previous quantity
+            **error_stats,
+        }
+
+    def load_model(
+        self,
+        item_id: str,
+        model_path: Optional[str] = None,
+        metadata_path: Optional[str] = None,
+    ) -> bool:
+        """
+        Load a model saved as its own checkpoint file.
+
+        Args:
+            item_id: Unique item identifier
+            model_path: Checkpoint path already known to exist (skips the
+                existence check); defaults to <model_dir>/<item_id>.pt
+            metadata_path: Metadata path; defaults to <model_dir>/<item_id>_meta.json
 
         Returns:
             True if model was loaded successfully
         """
-        model_path = self.model_dir / f"{item_id}.pt"
-        metadata_path = self.model_dir / f"{item_id}_meta.json"
-
-        if not model_path.exists():
-            return False
+        if model_path is None:
+            model_path = self.model_dir / f"{item_id}.pt"
+            if not model_path.exists():
+                return False
+        if metadata_path is None:
+            metadata_path = self.model_dir / f"{item_id}_meta.json"
 
         try:
             # Load model
             model = ConsumptionForecaster.load_checkpoint(str(model_path))
 
-            # Load metadata
+            # Load metadata (optional)
             metadata = {}
-            if metadata_path.exists():
+            try:
                 with open(metadata_path) as f:
                     metadata = json.load(f)
+            except FileNotFoundError:
+                pass
 
-            # Initialize state (will be updated with next observation)
-            state = torch.zeros(model.state_dim)
-
-            # Register model
-            self.models[item_id] = {
-                "model": model,
-                "state": state,
-                "last_trained": datetime.fromisoformat(metadata.get(
-                    "last_trained",
-                    datetime.now().isoformat()
-                )),
-                "last_retrained": datetime.fromisoformat(metadata.get(
-                    "last_retrained",
-                    datetime.now().isoformat()
-                )),
-                "observations": [],
-                "errors": metadata.get("recent_errors", []),
-                "prev_qty": state[0].item(),  # Initialize previous quantity
-            }
+            self._register_loaded_model(item_id, model, metadata)
 
             self.logger.info(f"Loaded model for item {item_id}")
             return True
@@ -516,51 +890,207 @@ class OnlineForecastTrainer:
             self.logger.error(f"Failed to load model for {item_id}: {e}")
             return False
 
-    def load_all_models(self) -> int:
+    def _read_shard_metadata(self) -> Dict[str, Dict[str, Any]]:
+        """Read meta.json (item_id -> metadata); empty if it does not exist."""
+        try:
+            with open(self.model_dir / _SHARD_METADATA, "rb") as f:
+                payload = f.read()
+        except FileNotFoundError:
+            return {}
+        return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+
+    def _load_sharded_models(
+        self,
+        checkpoint_path: str,
+        item_ids: Optional[set] = None,
+    ) -> int:
+        """
+        Load models from the sharded checkpoint.
+
+        Args:
+            checkpoint_path: Path to models.pt
+            item_ids: Only load these items (all if None)
+
+        Returns:
+            Number of models loaded
+        """
+        try:
+            # One sequential read; mmap pages tensor data in on access
+            checkpoints = torch.load(
+                checkpoint_path, map_location="cpu", weights_only=True, mmap=True
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to read {checkpoint_path}: {e}")
+            return 0
+
+        all_metadata = self._read_shard_metadata()
+
+        count = 0
+        for item_id, checkpoint in checkpoints.items():
+            if item_ids is not None and item_id not in item_ids:
+                continue
+            try:
+                model = ConsumptionForecaster.from_checkpoint(checkpoint)
+                self._register_loaded_model(
+                    item_id,
+                    model,
+                    all_metadata.get(item_id, {}),
+                    checkpoint.get("state"),
+                )
+                count += 1
+            except Exception as e:
+                self.logger.error(f"Failed to load model for {item_id}: {e}")
+
+        return count
+
+    def load_all_models(self, item_ids: Optional[set] = None) -> int:
         """
         Load all models from disk.
 
+        Reads the sharded checkpoint written by save_all_models, then any
+        per-item <item_id>.pt files (older layout) for items it lacks.
+
+        Args:
+            item_ids: Only load these items (all if None)
+
         Returns:
             Number of models loaded
         """
+        # One directory pass; the entries confirm each checkpoint exists
+        shard_path = None
+        model_files = []
+        with os.scandir(self.model_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".pt") or not entry.is_file():
+                    continue
+                if entry.name == _SHARD_CHECKPOINT:
+                    shard_path = entry.path
+                else:
+                    model_files.append((entry.name[:-3], entry.path))
+
         count = 0
-        for model_file in self.model_dir.glob("*.pt"):
-            item_id = model_file.stem
-            if self.load_model(item_id):
+        if shard_path is not None:
+            count += self._load_sharded_models(shard_path, item_ids)
+
+        model_dir = str(self.model_dir)
+        for item_id, model_path in model_files:
+            if item_id in self.models or (item_ids is not None and item_id not in item_ids):
+                continue
+            metadata_path = os.path.join(model_dir, f"{item_id}_meta.json")
+            if self.load_model(item_id, model_path, metadata_path):
                 count += 1
 
         self.logger.info(f"Loaded {count} models from {self.model_dir}")
         return count
 
+    def _saved_trained_items(self, item_ids: set) -> set:
+        """
+        Find items whose saved model was trained on enough observations.
+
+        Args:
+            item_ids: Candidate item identifiers
+
+        Returns:
+            Subset of item_ids with at least 5 observations on disk
+        """
+        if not item_ids:
+            return set()
+
+        all_metadata = self._read_shard_metadata()
+        saved = set()
+        for item_id in item_ids:
+            metadata = all_metadata.get(item_id)
+            if metadata is None:
+                # Older per-item layout
+                try:
+                    with open(self.model_dir / f"{item_id}_meta.json") as f:
+                        metadata = json.load(f)
+                except FileNotFoundError:
+                    continue
+            if metadata.get("n_observations", 0) >= 5:
+                saved.add(item_id)
+        return saved
+
     def get_model_performance(self, item_id: str) -> Optional[Dict[str, float]]:
         """Get performance metrics for a model."""
         if item_id not in self.models:
             return None
 
-        errors = self.models[item_id]["errors"]
-        if not errors:
+        info = self.models[item_id]
+        if not info["err_count"]:
             return None
 
         return {
-            "mae": sum(abs(e) for e in errors) / len(errors),
-            "rmse": (sum(e**2 for e in errors) / len(errors))**0.5,
-            "ewma_error": self._compute_ewma(errors),
-            "n_observations": len(self.models[item_id]["observations"]),
+            "mae": info["abs_sum"] / info["err_count"],
+            "rmse": (info["sq_sum"] / info["err_count"])**0.5,
+            "ewma_error": info["ewma_error"],
+            "n_observations": len(info["observations"]),
         }
 
+    def _item_lock(self, item_id: str) -> threading.Lock:
+        """Get the lock serializing training of one item."""
+        with self._item_locks_guard:
+            return self._item_locks[item_id]
+
+    def _train_one(
+        self,
+        item_data: Dict[str, Any],
+        now_ts: float,
+        force_retrain: bool,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Train or retrain the model for a single item.
+
+        Args:
+            item_data: Item data dictionary with item_id and metadata
+            now_ts: Epoch seconds at the start of the training pass
+            force_retrain: If True, retrain even if recent training exists
+
+        Returns:
+            Summary entry for the item, or None if it was skipped
+        """
+        item_id = item_data["item_id"]
+
+        with self._item_lock(item_id):
+            # Check if model already exists
+            if item_id in self.models and not force_retrain:
+                # Check if recent training exists
+                seconds_since = now_ts - self.models[item_id]["last_retrained_ts"]
+
+                if seconds_since < self.retrain_interval_days * 86400:
+                    return None
+
+            # Get or create model (will use pre-trained if available)
+            model, state = self.get_or_create_model(item_id, item_data)
+
+            # If model has observations, retrain from scratch
+            if item_id in self.models and len(self.models[item_id]["observations"]) >= 5:
+                self._retrain_from_scratch(item_id, item_data)
+
+            return {
+                "item_id": item_id,
+                "name": item_data.get("name", "Unknown"),
+                "category": item_data.get("category", "Unknown"),
+                "pretrained": self.models[item_id].get("pretrained", False),
+            }
+
     def train_all_models(
         self,
         items_data: List[Dict[str, Any]],
         force_retrain: bool = False,
+        max_workers: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Train or retrain models for all items with sufficient history.
 
         This method can be triggered manually by the user or run on a schedule.
+        Items are trained concurrently on a bounded thread pool; checkpoint
+        I/O and most tensor ops release the GIL.
 
         Args:
             items_data: List of item data dictionaries with item_id and metadata
             force_retrain: If True, retrain even if recent training exists
+            max_workers: Worker threads (defaults to min(8, CPU count))
 
         Returns:
             Dictionary with training summary
@@ -574,40 +1104,52 @@ class OnlineForecastTrainer:
             "items": [],
         }
 
-        for item_data in items_data:
-            item_id = item_data.get("item_id")
-            if not item_id:
-                continue
+        # One clock read for the whole pass
+        now_ts = datetime.now().timestamp()
 
-            try:
-                # Check if model already exists
-                if item_id in self.models and not force_retrain:
-                    # Check if recent training exists
-                    last_retrained = self.models[item_id]["last_retrained"]
-                    days_since = (datetime.now() - last_retrained).days
-
-                    if days_since < self.retrain_interval_days:
-                        results["skipped"] += 1
-                        continue
+        items_data = [item_data for item_data in items_data if item_data.get("item_id")]
 
-                # Get or create model (will use pre-trained if available)
-                model, state = self.get_or_create_model(item_id, item_data)
+        # Items with trained weights on disk resume from those rather than
+        # paying for a pre-trained checkpoint that would be a worse start
+        saved_ids = self._saved_trained_items(
+            {item_data["item_id"] for item_data in items_data} - self.models.keys()
+        )
+        if saved_ids:
+            self.load_all_models(saved_ids)
 
-                # If model has observations, retrain from scratch
-                if item_id in self.models and len(self.models[item_id]["observations"]) >= 5:
-                    self._retrain_from_scratch(item_id, item_data)
+        if max_workers is None:
+            max_workers = min(8, os.cpu_count() or 1)
 
-                results["trained"] += 1
-                results["items"].append({
-                    "item_id": item_id,
-                    "name": item_data.get("name", "Unknown"),
-                    "category": item_data.get("category", "Unknown"),
-                    "pretrained": self.models[item_id].get("pretrained", False),
-                })
+        # Tiny per-item models gain nothing from intra-op parallelism; keep
+        # torch to one thread while the pool runs to avoid oversubscription
+        # (the setting is process-wide, so it is restored afterwards)
+        torch_threads = torch.get_num_threads()
+        torch.set_num_threads(1)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._train_one, item_data, now_ts, force_retrain)
+                    for item_data in items_data
+                ]
+
+                # Collect in submission order so the summary is deterministic
+                for item_data, future in zip(items_data, futures, strict=True):
+                    try:
+                        item_result = future.result()
+                    except Exception as e:
+                        self.logger.error(
+                            f"Failed to train model for {item_data['item_id']}: {e}"
+                        )
+                        results["failed"] += 1
+                        continue
 
-            except Exception as e:
-                self.logger.error(f"Failed to train model for {item_id}: {e}")
-                results["failed"] += 1
+                    if item_result is None:
+                        results["skipped"] += 1
+                    else:
+                        results["trained"] += 1
+                        results["items"].append(item_result)
+        finally:
+            torch.set_num_threads(torch_threads)
 
         self.logger.info(
             f"Training complete: {results['trained']} trained, "
@@ -7,11 +7,120 @@ The model tracks consumption patterns and predicts future inventory levels.
 State: [quantity, consumption_rate, trend, seasonal_component]
 """
 
+import functools
+from collections.abc import Sequence
 import torch
 import torch.nn as nn
 from typing import Tuple, Optional, Dict, Any
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+
+
+# Two-sided normal z-scores for the common confidence levels
+_Z_SCORES = {
+    0.90: 1.6448536269514722,
+    0.95: 1.959963984540054,
+    0.99: 2.5758293035489004,
+}
+
+
+@functools.lru_cache(maxsize=16)
+def _z_score(confidence: float) -> float:
+    """Two-sided normal z-score for a confidence level (cached per level)."""
+    z_score = _Z_SCORES.get(confidence)
+    if z_score is not None:
+        return z_score
+
+    # scipy.stats is slow to import, so it is only loaded for other levels
+    from scipy.stats import norm
+    return float(norm.ppf((1 + confidence) / 2))
+
+
+def _kalman_step(
+    state_cov: np.ndarray,
+    obs_matrix: np.ndarray,
+    obs_var: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Kalman gain and posterior covariance (Joseph form) on NumPy arrays.
+
+    S = H * P * H^T + R * I
+    K = P * H^T * S^-1
+    P = (I - K*H) * P * (I - K*H)^T + K * R * K^T
+
+    Unlike P = (I - K*H) * P, the Joseph form stays symmetric positive
+    semi-definite under rounding, so long online runs do not drift into
+    negative variances (and NaN gains). With state_dim = 4 the cost is all
+    per-op dispatch, which is far cheaper in NumPy (or Numba) than torch.
+
+    A scalar observation divides by S directly; a multi-dimensional one
+    solves against the Cholesky factor of S instead of inverting it.
+
+    Args:
+        state_cov: Prior covariance [state_dim, state_dim]
+        obs_matrix: Observation matrix H [obs_dim, state_dim]
+        obs_var: Observation noise variance R (per observed component)
+
+    Returns:
+        Tuple of (kalman_gain [state_dim, obs_dim], posterior covariance)
+    """
+    obs_dim, state_dim = obs_matrix.shape
+    cov_obs = state_cov @ obs_matrix.T
+    innovation_cov = obs_matrix @ cov_obs + obs_var * np.eye(obs_dim, dtype=state_cov.dtype)
+
+    if obs_dim == 1:
+        kalman_gain = cov_obs / innovation_cov[0, 0]
+    else:
+        # S = L * L^T, so K^T = S^-1 * (P * H^T)^T takes two triangular solves
+        chol = np.linalg.cholesky(innovation_cov)
+        kalman_gain = np.linalg.solve(chol.T, np.linalg.solve(chol, cov_obs.T)).T
+
+    cov_update = np.eye(state_dim, dtype=state_cov.dtype) - kalman_gain @ obs_matrix
+    new_cov = cov_update @ state_cov @ cov_update.T + (kalman_gain @ kalman_gain.T) * obs_var
+    # Remove the asymmetry rounding leaves behind
+    return kalman_gain, 0.5 * (new_cov + new_cov.T)
+
+
+@functools.cache
+def _kalman_kernel():
+    """
+    Get the Kalman step, JIT-compiled with Numba when it is installed.
+
+    Numba is imported on first use rather than at module import, so cold
+    start does not pay for it.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return _kalman_step
+    return njit(cache=True)(_kalman_step)
+
+
+def _transition_step(
+    state: torch.Tensor,
+    features: torch.Tensor,
+    weight: torch.Tensor,
+    bias: torch.Tensor,
+    obs_weight: torch.Tensor,
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    One transition and observation step on raw parameter tensors.
+
+    Equivalent to observation(transition(cat([state, features]))) but
+    without the nn.Module call overhead of the two Linear layers.
+
+    Args:
+        state: State vector [state_dim]
+        features: Feature vector [feature_dim]
+        weight: Transition weight [state_dim, state_dim + feature_dim]
+        bias: Transition bias [state_dim]
+        obs_weight: Observation weight [1, state_dim]
+
+    Returns:
+        Tuple of (next_state [state_dim], predicted_quantity [1])
+    """
+    next_state = torch.addmv(bias, weight, torch.cat([state, features], dim=0))
+    return next_state, torch.mv(obs_weight, next_state)
 
 
 class ConsumptionForecaster(nn.Module):
@@ -66,16 +175,45 @@ class ConsumptionForecaster(nn.Module):
         self.process_noise = nn.Parameter(torch.tensor(process_noise_std))
         self.obs_noise = nn.Parameter(torch.tensor(obs_noise_std))
 
+        # Constant tensors reused on every step (not saved in checkpoints)
+        self._register_constants()
+
         # State covariance (uncertainty in state estimate)
-        self.state_cov = torch.eye(state_dim) * 0.1
+        self.state_cov = self._eye * 0.1
 
         # Optimizer for online learning
         self.optimizer = torch.optim.Adam(self.parameters(), lr=learning_rate)
 
+        # NumPy view of the observation matrix for the Kalman math (see
+        # _obs_matrix_np), keyed by the weight's storage address
+        self._obs_np = None
+        self._obs_np_ptr = None
+
         # Metadata
         self.training_steps = 0
         self.last_loss = None
 
+    def _obs_matrix_np(self) -> np.ndarray:
+        """
+        Get the observation matrix H [1, state_dim] as a NumPy array.
+
+        On CPU this is a view of the weight's storage, so in-place optimizer
+        steps show through it and it only has to be rebuilt when the weight
+        tensor itself is replaced (e.g. load_state_dict with assign=True).
+        """
+        weight = self.observation.weight
+        if weight.device.type != "cpu":
+            return weight.detach().cpu().numpy()
+        if self._obs_np_ptr != weight.data_ptr():
+            self._obs_np = weight.detach().numpy()
+            self._obs_np_ptr = weight.data_ptr()
+        return self._obs_np
+
+    def _register_constants(self) -> None:
+        """Register the identity and zero-feature buffers."""
+        self.register_buffer("_eye", torch.eye(self.state_dim), persistent=False)
+        self.register_buffer("_zero_features", torch.zeros(self.feature_dim), persistent=False)
+
     def forward(
         self,
         state: torch.Tensor,
@@ -92,20 +230,18 @@ class ConsumptionForecaster(nn.Module):
             Tuple of (next_state, predicted_quantity)
         """
         if features is None:
-            features = torch.zeros(self.feature_dim)
-
-        # Combine state and features
-        state_features = torch.cat([state, features], dim=0)
-
-        # Predict next state (deterministic mean)
-        next_state_mean = self.transition(state_features)
-        next_state = next_state_mean
-
-        # Predict observation (quantity)
-        predicted_quantity = self.observation(next_state)
-
-        return next_state, predicted_quantity
+            features = self._zero_features
+
+        # Predict next state (deterministic mean) and observation (quantity)
+        return _transition_step(
+            state,
+            features,
+            self.transition.weight,
+            self.transition.bias,
+            self.observation.weight,
+        )
 
+    @torch.no_grad()
     def predict_trajectory(
         self,
         initial_state: torch.Tensor,
@@ -126,52 +262,54 @@ class ConsumptionForecaster(nn.Module):
                 - quantities: Predicted quantities [n_steps]
                 - uncertainties: Standard deviations [n_steps]
         """
-        states = []
-        quantities = []
-        uncertainties = []
-
-        current_state = initial_state.clone()
-        current_cov = self.state_cov.clone()
-
-        for step in range(n_steps):
-            # Get features for this step
-            if features_sequence is not None and step < len(features_sequence):
-                features = features_sequence[step]
-            else:
-                features = torch.zeros(self.feature_dim)
-
-            # Predict next state (mean)
-            state_features = torch.cat([current_state, features], dim=0)
-            next_state_mean = self.transition(state_features)
-
-            # Physics constraint: quantity should not increase naturally (no magic restocking)
-            if next_state_mean[0] > current_state[0]:
-                next_state_mean[0] = current_state[0] - max(0.01, current_state[1])
+        state_dim = self.state_dim
 
-            # Predict quantity
-            predicted_quantity = self.observation(next_state_mean)
+        # Feature rows for every step; missing trailing steps stay zero
+        features = torch.zeros(n_steps, self.feature_dim)
+        if features_sequence is not None:
+            n_given = min(len(features_sequence), n_steps)
+            features[:n_given] = features_sequence[:n_given]
 
-            # Compute uncertainty (from covariance)
-            # Simplified: use trace of covariance as overall uncertainty
-            uncertainty = torch.sqrt(torch.trace(current_cov) / self.state_dim)
+        states = torch.empty(n_steps, state_dim)
 
-            # Store predictions
-            states.append(next_state_mean)
-            quantities.append(predicted_quantity.item())
-            uncertainties.append(uncertainty.item())
+        weight = self.transition.weight
+        state_weight = weight[:, :state_dim]
 
-            # Update state and covariance for next iteration
-            current_state = next_state_mean
-
-            # Propagate covariance (simplified linear propagation)
-            # In full Kalman filter: P_k+1 = F * P_k * F^T + Q
-            current_cov = current_cov + torch.eye(self.state_dim) * self.process_noise**2
-
-        return (
-            torch.stack(states),
-            torch.tensor(quantities),
-            torch.tensor(uncertainties),
+        # The feature block of the transition does not depend on the
+        # state, so its contribution (plus bias) is one matmul up front
+        feature_terms = torch.addmm(
+            self.transition.bias, features, weight[:, state_dim:].T
         )
+        current_state = initial_state
+
+        for step in range(n_steps):
+            # Predict next state (mean), written straight into the output
+            next_state = states[step]
+            torch.addmv(feature_terms[step], state_weight, current_state, out=next_state)
+
+            # Physics constraint: quantity should not increase naturally
+            # (no magic restocking)
+            next_state[0] = torch.where(
+                next_state[0] > current_state[0],
+                current_state[0] - current_state[1].clamp(min=0.01),
+                next_state[0],
+            )
+
+            current_state = next_state
+
+        # Observation head for all steps at once: one matvec
+        quantities = torch.mv(states, self.observation.weight[0])
+
+        # Compute uncertainty (from covariance)
+        # Simplified: use trace of covariance as overall uncertainty.
+        # The covariance is propagated as P_k+1 = P_k + I * sigma^2 (the
+        # full Kalman filter would use F * P_k * F^T + Q), so only its
+        # trace matters and that grows by state_dim * sigma^2 per step
+        trace0 = torch.trace(self.state_cov)
+        traces = trace0 + torch.arange(n_steps) * (state_dim * self.process_noise**2)
+        uncertainties = torch.sqrt(traces / state_dim)
+
+        return states, quantities, uncertainties
 
     def update(
         self,
@@ -193,37 +331,24 @@ class ConsumptionForecaster(nn.Module):
             Tuple of (updated_state, prediction_error)
         """
         if features is None:
-            features = torch.zeros(self.feature_dim)
+            features = self._zero_features
 
-        # Prediction step
-        state_features = torch.cat([state, features], dim=0)
-        predicted_state = self.transition(state_features)
-        predicted_quantity = self.observation(predicted_state)
+        # Prediction step; the autograd graph is only needed for learning
+        with torch.set_grad_enabled(perform_learning):
+            predicted_state, predicted_quantity = self.forward(state, features)
 
         # Compute prediction error
         prediction_error = observation - predicted_quantity.item()
 
-        # Kalman gain (simplified version)
-        # K = P * H^T / (H * P * H^T + R)
-        obs_matrix = self.observation.weight.squeeze()  # [state_dim]
-
-        # Innovation covariance
-        innovation_cov = (
-            torch.dot(obs_matrix, torch.matmul(self.state_cov, obs_matrix))
-            + self.obs_noise**2
+        # Kalman gain and covariance update (Joseph form for numerical
+        # stability); no autograd is needed, so this runs in NumPy
+        kalman_gain, state_cov = _kalman_kernel()(
+            self.state_cov.cpu().numpy(), self._obs_matrix_np(), self.obs_noise.item()**2
         )
-
-        # Kalman gain
-        kalman_gain = torch.matmul(self.state_cov, obs_matrix) / innovation_cov
+        self.state_cov = torch.from_numpy(state_cov)
 
         # Update state estimate
-        updated_state = predicted_state + kalman_gain * prediction_error
-
-        # Update covariance (Joseph form for numerical stability)
-        # P = (I - K*H) * P
-        identity = torch.eye(self.state_dim)
-        cov_update = identity - torch.outer(kalman_gain, obs_matrix)
-        self.state_cov = torch.matmul(cov_update, self.state_cov)
+        updated_state = predicted_state.detach() + torch.from_numpy(kalman_gain[:, 0]) * prediction_error
 
         # Parameter learning (gradient descent on prediction error)
         if perform_learning and prediction_error**2 > 1e-6:
@@ -241,8 +366,108 @@ class ConsumptionForecaster(nn.Module):
             self.last_loss = loss.item()
             self.training_steps += 1
 
-        return updated_state.detach(), prediction_error
+        return updated_state, prediction_error
+
+    def update_batch(
+        self,
+        state: torch.Tensor,
+        observations: torch.Tensor,
+        features_sequence: Optional[torch.Tensor] = None,
+        perform_learning: bool = True,
+        chunk_size: int = 8,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Filter a whole observation sequence, learning from it chunk by chunk.
+
+        Runs the same Kalman recursion as update() without autograd, a chunk
+        of observations at a time. After each chunk, one optimizer step is
+        taken on the chunk's mean squared prediction error, replaying the
+        predictions from the chunk's prior states in one batched forward
+        pass. The learning rate is scaled by chunk_size for these steps, so
+        the parameters move about as far as with one update() step per
+        observation while taking chunk_size times fewer steps. Filtering
+        uses the parameters learned so far, as update() does.
+
+        Args:
+            state: Initial state estimate [state_dim]
+            observations: Observed quantities [n_steps]
+            features_sequence: External features [n_steps, feature_dim]
+            perform_learning: Whether to update model parameters
+            chunk_size: Observations per optimizer step (1 matches update())
+
+        Returns:
+            Tuple of (final_state, prediction_errors [n_steps])
+        """
+        n_steps = len(observations)
+        if features_sequence is None:
+            features_sequence = torch.zeros(n_steps, self.feature_dim)
+
+        errors = torch.empty(n_steps)
 
+        # Kalman math runs in NumPy (see _kalman_step)
+        kalman_step = _kalman_kernel()
+        state_cov = self.state_cov.cpu().numpy()
+
+        base_lrs = [group["lr"] for group in self.optimizer.param_groups]
+        if perform_learning:
+            for group in self.optimizer.param_groups:
+                group["lr"] *= chunk_size
+
+        try:
+            for start in range(0, n_steps, chunk_size):
+                stop = min(start + chunk_size, n_steps)
+                prior_states = []
+
+                with torch.no_grad():
+                    obs_matrix = self.observation.weight.squeeze()  # [state_dim]
+                    weight = self.transition.weight
+                    bias = self.transition.bias
+                    obs_matrix_np = self._obs_matrix_np()
+                    obs_var = self.obs_noise.item()**2
+
+                    for step in range(start, stop):
+                        prior_states.append(state)
+
+                        # Prediction step
+                        predicted_state, _ = _transition_step(
+                            state, features_sequence[step], weight, bias, obs_matrix.unsqueeze(0)
+                        )
+                        error = observations[step] - torch.dot(obs_matrix, predicted_state)
+
+                        # Kalman gain and state/covariance update
+                        kalman_gain, state_cov = kalman_step(state_cov, obs_matrix_np, obs_var)
+                        state = predicted_state + torch.from_numpy(kalman_gain[:, 0]) * error
+
+                        errors[step] = error
+
+                # Parameter learning: one gradient step over the chunk's
+                # informative steps (same threshold as update())
+                learn_mask = errors[start:stop]**2 > 1e-6
+                if perform_learning and learn_mask.any():
+                    inputs = torch.cat(
+                        [torch.stack(prior_states), features_sequence[start:stop]], dim=1
+                    )
+                    predicted = self.observation(self.transition(inputs[learn_mask])).squeeze(-1)
+
+                    self.optimizer.zero_grad()
+                    loss = ((predicted - observations[start:stop][learn_mask])**2).mean()
+                    loss.backward()
+
+                    # Clip gradients for stability
+                    torch.nn.utils.clip_grad_norm_(self.parameters(), max_norm=1.0)
+
+                    self.optimizer.step()
+
+                    self.last_loss = loss.item()
+                    self.training_steps += 1
+        finally:
+            for group, lr in zip(self.optimizer.param_groups, base_lrs, strict=True):
+                group["lr"] = lr
+            self.state_cov = torch.from_numpy(state_cov)
+
+        return state, errors
+
+    @torch.no_grad()
     def handle_restock(self, state: torch.Tensor, new_quantity: float) -> torch.Tensor:
         """
         Handle restocking event by resetting quantity but keeping consumption dynamics.
@@ -260,7 +485,7 @@ class ConsumptionForecaster(nn.Module):
         new_state[0] = new_quantity  # Update quantity
         # Keep consumption_rate, trend, and seasonal components
         # Reset covariance to moderate uncertainty
-        self.state_cov = torch.eye(self.state_dim) * 0.1
+        self.state_cov = self._eye * 0.1
         return new_state
 
     def initialize_state(
@@ -288,27 +513,25 @@ class ConsumptionForecaster(nn.Module):
         if recent_observations and len(recent_observations) >= 2:
             # Sort observations by timestamp if available
             sorted_obs = sorted(recent_observations, key=lambda x: x[1] if len(x) > 1 else 0)
-            quantities = [obs[0] for obs in sorted_obs]
+            quantities = np.fromiter(
+                (obs[0] for obs in sorted_obs), dtype=np.float64, count=len(sorted_obs)
+            )
 
             # Calculate only consumption drops (ignore restocks)
-            drops = []
-            for i in range(len(quantities) - 1):
-                diff = quantities[i] - quantities[i + 1]
-                if diff > 0:  # Only count decreases (consumption)
-                    drops.append(diff)
+            diffs = -np.diff(quantities)
+            drops = diffs[diffs > 0]  # Only count decreases (consumption)
 
             # Average consumption rate
-            if drops:
-                avg_rate = np.mean(drops)
-                state[1] = avg_rate
+            if drops.size:
+                state[1] = float(drops.mean())
             else:
                 # No clear consumption pattern, use default
                 state[1] = 0.1 * max(1.0, current_quantity)
 
             # Estimate trend from drops if enough data
-            if len(drops) >= 2:
+            if drops.size >= 2:
                 trend = drops[-1] - drops[0]
-                state[2] = trend / len(drops)
+                state[2] = float(trend / drops.size)
         else:
             # Default: assume moderate consumption rate
             state[1] = 0.1 * max(1.0, current_quantity)
@@ -318,6 +541,7 @@ class ConsumptionForecaster(nn.Module):
 
         return state
 
+    @torch.no_grad()
     def compute_confidence_interval(
         self,
         predictions: torch.Tensor,
@@ -336,17 +560,17 @@ class ConsumptionForecaster(nn.Module):
             Tuple of (lower_bound, upper_bound) [n_steps]
         """
         # Z-score for desired confidence level
-        from scipy.stats import norm
-        z_score = norm.ppf((1 + confidence) / 2)
+        margin = _z_score(confidence) * uncertainties
 
-        lower_bound = predictions - z_score * uncertainties
-        upper_bound = predictions + z_score * uncertainties
+        lower_bound = predictions - margin
+        upper_bound = predictions + margin
 
         # Ensure non-negative quantities
         lower_bound = torch.clamp(lower_bound, min=0.0)
 
         return lower_bound, upper_bound
 
+    @torch.no_grad()
     def predict_runout_date(
         self,
         initial_state: torch.Tensor,
@@ -372,16 +596,41 @@ class ConsumptionForecaster(nn.Module):
             features_sequence,
             n_steps=max_days,
         )
+        return self.runout_from_trajectory(quantities, uncertainties, threshold)
+
+    @staticmethod
+    def runout_from_trajectory(
+        quantities: torch.Tensor,
+        uncertainties: torch.Tensor,
+        threshold: float = 0.0,
+    ) -> Tuple[Optional[int], float]:
+        """
+        Find the runout day in an already predicted trajectory.
 
-        # Find first day where quantity drops below threshold
-        for day, qty in enumerate(quantities):
-            if qty <= threshold:
-                # Confidence inversely related to uncertainty
-                confidence = 1.0 / (1.0 + uncertainties[day])
-                return day + 1, confidence
+        Lets callers that have just run predict_trajectory get the runout
+        prediction without rolling the trajectory out a second time.
 
-        # No runout predicted within max_days
-        return None, 0.0
+        Args:
+            quantities: Predicted quantities [n_steps]
+            uncertainties: Standard deviations [n_steps]
+            threshold: Quantity threshold for "runout" (default: 0.0)
+
+        Returns:
+            Tuple of (days_until_runout, confidence)
+                days_until_runout is None if no runout predicted
+        """
+        # Find first day where quantity drops below threshold (argmax
+        # returns the first maximum, i.e. the first True)
+        below = quantities <= threshold
+        day = int(torch.argmax(below.to(torch.uint8)))
+
+        if not below[day]:
+            # No runout predicted within max_days
+            return None, 0.0
+
+        # Confidence inversely related to uncertainty
+        confidence = 1.0 / (1.0 + float(uncertainties[day]))
+        return day + 1, confidence
 
     def get_metadata(self) -> Dict[str, Any]:
         """Get model metadata for logging/versioning."""
@@ -394,35 +643,231 @@ class ConsumptionForecaster(nn.Module):
             "obs_noise": self.obs_noise.item(),
         }
 
-    def save_checkpoint(self, path: str) -> None:
-        """Save model checkpoint."""
-        torch.save({
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """Get the checkpoint dictionary (weights, covariance, metadata)."""
+        return {
             "model_state_dict": self.state_dict(),
-            "state_cov": self.state_cov,
+            "state_cov": self.state_cov.detach(),
             "metadata": self.get_metadata(),
-        }, path)
+        }
+
+    def save_checkpoint(self, path: str) -> None:
+        """Save model checkpoint."""
+        torch.save(self.to_checkpoint(), path)
+
+    @classmethod
+    def from_state_dict(
+        cls,
+        state_dict: Dict[str, torch.Tensor],
+        state_cov: torch.Tensor,
+        **kwargs: Any,
+    ) -> "ConsumptionForecaster":
+        """
+        Build a model directly from saved weights, skipping random init.
+
+        The module is constructed on the meta device (no parameter storage
+        or initialization), then the weights are assigned in place of the
+        meta parameters. The tensors are copied (as float32) first, so the
+        source dict (e.g. a cached checkpoint) is never shared with the model.
+
+        Args:
+            state_dict: Saved model_state_dict
+            state_cov: Saved state covariance
+            **kwargs: Constructor arguments (state_dim, feature_dim, ...)
+
+        Returns:
+            Model holding the given weights
+        """
+        with torch.device("meta"):
+            model = cls(**kwargs)
+
+        # Everything is held as float32, whatever precision it was saved in
+        model.load_state_dict(
+            {
+                name: tensor.to(torch.float32, copy=True)
+                for name, tensor in state_dict.items()
+            },
+            assign=True,
+        )
+        model.state_cov = state_cov.to(torch.float32, copy=True)
+
+        # Non-persistent buffers were built on the meta device too
+        model._register_constants()
+
+        # The optimizer built in __init__ tracks the discarded meta parameters
+        model.optimizer = torch.optim.Adam(
+            model.parameters(),
+            lr=kwargs.get("learning_rate", 0.001),
+        )
+
+        return model
 
     @classmethod
     def load_checkpoint(cls, path: str) -> "ConsumptionForecaster":
         """Load model from checkpoint."""
-        checkpoint = torch.load(path, map_location="cpu")
+        # Checkpoints hold only tensors and plain metadata, so the restricted
+        # (weights_only) unpickler suffices; mmap avoids an up-front copy
+        checkpoint = torch.load(path, map_location="cpu", weights_only=True, mmap=True)
+        return cls.from_checkpoint(checkpoint)
 
-        # Create model with saved metadata
+    @classmethod
+    def from_checkpoint(cls, checkpoint: Dict[str, Any]) -> "ConsumptionForecaster":
+        """Build a model from a checkpoint dictionary (see to_checkpoint)."""
+        # Create model with saved metadata and weights
         metadata = checkpoint["metadata"]
-        model = cls(
+        model = cls.from_state_dict(
+            checkpoint["model_state_dict"],
+            checkpoint["state_cov"],
             state_dim=metadata["state_dim"],
             feature_dim=metadata["feature_dim"],
         )
-
-        # Load state dict
-        model.load_state_dict(checkpoint["model_state_dict"])
-        model.state_cov = checkpoint["state_cov"]
         model.training_steps = metadata["training_steps"]
         model.last_loss = metadata.get("last_loss")
 
         return model
 
 
+class BatchForecaster:
+    """
+    Structure-of-arrays view over several ConsumptionForecasters.
+
+    Stacks the per-item parameters along a leading item dimension so one
+    Kalman step for N items runs as batched matmuls instead of N separate
+    forwards. Parameters stay owned by the individual models (gradients flow
+    back through the stack) and each model keeps its own optimizer, so
+    per-item retraining and checkpoints are unaffected.
+    """
+
+    def __init__(self, models: Sequence[ConsumptionForecaster]):
+        """
+        Initialize the batch view.
+
+        Args:
+            models: Models sharing the same state and feature dimensions
+        """
+        self.models = list(models)
+        self.state_dim = self.models[0].state_dim
+
+        if any(m.state_dim != self.state_dim for m in self.models):
+            raise ValueError("All models in a batch must share state_dim")
+
+    def update(
+        self,
+        states: torch.Tensor,
+        observations: torch.Tensor,
+        features: torch.Tensor,
+        restock_mask: Optional[torch.Tensor] = None,
+        perform_learning: bool = True,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Run ConsumptionForecaster.update for every model in one batched step.
+
+        Rows flagged in restock_mask get ConsumptionForecaster.handle_restock
+        semantics instead: quantity reset, covariance reset, no learning.
+
+        Args:
+            states: Current state estimates [N, state_dim]
+            observations: Observed quantities [N]
+            features: External features [N, feature_dim]
+            restock_mask: Rows that are restock events [N] (optional)
+            perform_learning: Whether to update model parameters
+
+        Returns:
+            Tuple of (updated_states [N, state_dim], prediction_errors [N])
+                (errors are 0 for restocked rows)
+        """
+        n_items = len(self.models)
+
+        # Prediction step (kept in the autograd graph for learning)
+        weight = torch.stack([m.transition.weight for m in self.models])
+        bias = torch.stack([m.transition.bias for m in self.models])
+        obs_matrix = torch.stack([m.observation.weight.squeeze(0) for m in self.models])
+
+        state_features = torch.cat([states, features], dim=1)
+        predicted_state = torch.bmm(weight, state_features.unsqueeze(-1)).squeeze(-1) + bias
+        predicted_quantity = (obs_matrix * predicted_state).sum(dim=1)
+
+        errors = observations - predicted_quantity.detach()
+
+        with torch.no_grad():
+            obs_matrix = obs_matrix.detach()
+            state_cov = torch.stack([m.state_cov.detach() for m in self.models])
+            obs_var = torch.stack([m.obs_noise.detach() for m in self.models])**2
+            identity = self.models[0]._eye.expand(n_items, -1, -1)
+
+            # Kalman gain: K = P * H^T / (H * P * H^T + R)
+            cov_obs = torch.bmm(state_cov, obs_matrix.unsqueeze(-1)).squeeze(-1)
+            innovation_cov = (obs_matrix * cov_obs).sum(dim=1) + obs_var
+            kalman_gain = cov_obs / innovation_cov.unsqueeze(-1)
+
+            # State and covariance update (Joseph form):
+            # P = (I - K*H) * P * (I - K*H)^T + K * R * K^T
+            updated_states = predicted_state.detach() + kalman_gain * errors.unsqueeze(-1)
+            cov_update = identity - kalman_gain.unsqueeze(-1) * obs_matrix.unsqueeze(1)
+            state_cov = (
+                torch.bmm(torch.bmm(cov_update, state_cov), cov_update.transpose(1, 2))
+                + kalman_gain.unsqueeze(-1) * kalman_gain.unsqueeze(1) * obs_var.view(-1, 1, 1)
+            )
+            state_cov = 0.5 * (state_cov + state_cov.transpose(1, 2))
+
+            learn_mask = errors**2 > 1e-6
+
+            if restock_mask is not None:
+                restocked = states.clone()
+                restocked[:, 0] = observations
+                updated_states = torch.where(restock_mask.unsqueeze(-1), restocked, updated_states)
+                state_cov = torch.where(
+                    restock_mask.view(-1, 1, 1), identity * 0.1, state_cov
+                )
+                errors = torch.where(restock_mask, torch.zeros_like(errors), errors)
+                learn_mask &= ~restock_mask
+
+        for model, cov in zip(self.models, state_cov.unbind(0), strict=True):
+            model.state_cov = cov
+
+        # Parameter learning: the summed loss separates per model, so one
+        # backward yields each model's own gradient
+        if perform_learning and learn_mask.any():
+            for model in self.models:
+                model.optimizer.zero_grad()
+
+            losses = (predicted_quantity - observations)**2
+            losses[learn_mask].sum().backward()
+
+            loss_values = losses.detach().tolist()
+            for i in learn_mask.nonzero().flatten().tolist():
+                model = self.models[i]
+                torch.nn.utils.clip_grad_norm_(model.parameters(), max_norm=1.0)
+                model.optimizer.step()
+                model.last_loss = loss_values[i]
+                model.training_steps += 1
+
+        return updated_states, errors
+
+
+@functools.lru_cache(maxsize=256)
+def _date_features(year: int, month: int, day: int) -> Tuple[float, float, float, float]:
+    """
+    Calendar features of a date (cached per date).
+
+    Args:
+        year: Year
+        month: Month (1-12)
+        day: Day of month
+
+    Returns:
+        Tuple of (day of week, day of month, month of year, is weekend),
+        each normalized to 0-1
+    """
+    weekday = date(year, month, day).weekday()
+    return (
+        weekday / 6.0,  # Day of week
+        day / 31.0,  # Day of month
+        month / 12.0,  # Month of year
+        1.0 if weekday >= 5 else 0.0,  # Is weekend (binary)
+    )
+
+
 def extract_features(
     item_data: Dict[str, Any],
     current_date: Optional[datetime] = None,
@@ -437,52 +882,103 @@ def extract_features(
     Returns:
         Feature vector [feature_dim=8]
     """
-    features = torch.zeros(8)
-
     if current_date is None:
         current_date = datetime.now()
 
-    # Feature 0: Day of week (normalized 0-1)
-    features[0] = current_date.weekday() / 6.0
+    # Feature 6: Days until expiry (if perishable)
+    expiry_feature = 0.5  # Default middle value
+    expiry = _parse_expiry(item_data)
+    if expiry is not None:
+        try:
+            days_until_expiry = (expiry - current_date).days
+            expiry_feature = max(0.0, min(1.0, days_until_expiry / 30.0))
+        except Exception:
+            pass
 
-    # Feature 1: Day of month (normalized 0-1)
-    features[1] = current_date.day / 31.0
+    # Built as one list so the tensor is constructed in a single call
+    features = [
+        # Features 0-3: calendar features, shared by every item on the same day
+        *_date_features(current_date.year, current_date.month, current_date.day),
+        # Feature 4: Household size (if provided), normalized assuming max 10
+        item_data.get("household_size", 2) / 10.0,
+        # Feature 5: Perishable indicator
+        1.0 if item_data.get("perishable", False) else 0.0,
+        expiry_feature,
+        # Feature 7: Reserved for future use (e.g., holiday indicator)
+        0.0,
+    ]
 
-    # Feature 2: Month of year (normalized 0-1)
-    features[2] = current_date.month / 12.0
+    return torch.tensor(features, dtype=torch.float32)
 
-    # Feature 3: Is weekend (binary)
-    features[3] = 1.0 if current_date.weekday() >= 5 else 0.0
 
-    # Feature 4: Household size (if provided)
-    household_size = item_data.get("household_size", 2)
-    features[4] = household_size / 10.0  # Normalize assuming max 10
+def _parse_expiry(item_data: Dict[str, Any]) -> Optional[datetime]:
+    """
+    Get the item's expiry as a datetime.
 
-    # Feature 5: Perishable indicator
-    features[5] = 1.0 if item_data.get("perishable", False) else 0.0
+    Args:
+        item_data: Dictionary with item information
 
-    # Feature 6: Days until expiry (if perishable)
-    features[6] = 0.5  # Default middle value
-    if item_data.get("expiry_date"):
-        try:
-            exp_val = item_data["expiry_date"]
-            # Handle both string and date types
-            if isinstance(exp_val, str):
-                expiry = datetime.fromisoformat(exp_val)
-            else:
-                # Assume it's a date object, convert to datetime
-                from datetime import date
-                if isinstance(exp_val, date):
-                    expiry = datetime.combine(exp_val, datetime.min.time())
-                else:
-                    expiry = exp_val
+    Returns:
+        Expiry datetime, or None if missing or unparseable
+    """
+    exp_val = item_data.get("expiry_date")
+    if not exp_val:
+        return None
+
+    try:
+        # Handle both string and date types
+        if isinstance(exp_val, str):
+            return datetime.fromisoformat(exp_val)
+        if isinstance(exp_val, date):
+            # Dates (and datetimes) count from midnight
+            return datetime.combine(exp_val, datetime.min.time())
+        return exp_val
+    except Exception:
+        return None
+
+
+def extract_features_batch(
+    item_data: Dict[str, Any],
+    dates: Sequence[datetime],
+) -> torch.Tensor:
+    """
+    Extract feature vectors for many dates at once.
 
-            days_until_expiry = (expiry - current_date).days
-            features[6] = max(0.0, min(1.0, days_until_expiry / 30.0))
-        except Exception:
-            pass
+    Produces the same values as calling extract_features for each date,
+    but computes the calendar features with NumPy datetime arithmetic.
+    Dates are expected to be naive (local) datetimes.
+
+    Args:
+        item_data: Dictionary with item information
+        dates: Dates to extract features for
+
+    Returns:
+        Feature matrix [len(dates), feature_dim=8]
+    """
+    when = np.asarray(dates, dtype="datetime64[s]")
+    days = when.astype("datetime64[D]")
+    months = when.astype("datetime64[M]")
+
+    features = np.zeros((len(when), 8), dtype=np.float32)
+
+    # 1970-01-01 was a Thursday (weekday 3)
+    weekday = (days.astype(np.int64) + 3) % 7
+
+    # Features 0-3: day of week, day of month, month of year, is weekend
+    features[:, 0] = weekday / 6.0
+    features[:, 1] = ((days - months).astype(np.int64) + 1) / 31.0
+    features[:, 2] = (months.astype(np.int64) % 12 + 1) / 12.0
+    features[:, 3] = weekday >= 5
+
+    # Features 4-5: household size and perishable indicator
+    features[:, 4] = item_data.get("household_size", 2) / 10.0
+    features[:, 5] = 1.0 if item_data.get("perishable", False) else 0.0
 
-    # Feature 7: Reserved for future use (e.g., holiday indicator)
-    features[7] = 0.0
+    # Feature 6: Days until expiry (floor division matches timedelta.days)
+    features[:, 6] = 0.5
+    expiry = _parse_expiry(item_data)
+    if isinstance(expiry, datetime) and expiry.tzinfo is None:
+        seconds = (np.datetime64(expiry, "s") - when).astype(np.int64)
+        features[:, 6] = np.clip((seconds // 86400) / 30.0, 0.0, 1.0)
 
-    return features
+    return torch.from_numpy(features)
@@ -2,13 +2,14 @@
 Data ingestion components for P3-Edge.
 """
 
-from .receipt_ocr import ReceiptOCR, ReceiptItem, process_receipt_image
+from .receipt_ocr import ReceiptOCR, ReceiptItem, process_receipt_image, process_receipt_images
 from .smart_fridge_simulator import SmartFridgeSimulator, get_mock_inventory
 
 __all__ = [
     "ReceiptOCR",
     "ReceiptItem",
     "process_receipt_image",
+    "process_receipt_images",
     "SmartFridgeSimulator",
     "get_mock_inventory",
 ]
@@ -5,7 +5,9 @@ Uses Tesseract OCR with preprocessing for better accuracy.
 Enhanced with LLM-based parsing for improved item extraction.
 """
 
+import functools
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
@@ -27,6 +29,49 @@ except ImportError:
     LLM_AVAILABLE = False
 
 
+# Common grocery item patterns (used as fallback), compiled once
+_ITEM_PATTERNS: Tuple[re.Pattern, ...] = (
+    # Pattern: ITEM NAME ... $PRICE
+    re.compile(r"^([\w\s\-']+?)\s+[\.\s]+\s+\$?(\d+\.\d{2})$"),
+    # Pattern: ITEM NAME $PRICE
+    re.compile(r"^([\w\s\-']+?)\s+\$?(\d+\.\d{2})$"),
+    # Pattern: QTY ITEM NAME @ PRICE
+    re.compile(r"^(\d+)\s+([\w\s\-']+?)\s+@\s+\$?(\d+\.\d{2})$"),
+)
+
+# Quantity pattern
+_QTY_PATTERN = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(lb|oz|kg|g|ct|count|gallon|liter)?s?",
+    re.IGNORECASE,
+)
+
+# Common header/footer keywords, matched as substrings of the lowercased
+# line in one regex scan (lowercasing first is much faster than IGNORECASE)
+_HEADER_FOOTER_KEYWORDS = (
+    "store",
+    "walmart",
+    "target",
+    "kroger",
+    "safeway",
+    "total",
+    "subtotal",
+    "tax",
+    "change",
+    "cash",
+    "credit",
+    "card",
+    "thank you",
+    "receipt",
+    "date",
+    "time",
+    "cashier",
+)
+_HEADER_FOOTER_PATTERN = re.compile("|".join(map(re.escape, _HEADER_FOOTER_KEYWORDS)))
+
+# Noise characters stripped from lines without a price
+_NOISE_PATTERN = re.compile(r"[\$\*\#\@]")
+
+
 @dataclass
 class ReceiptItem:
     """Extracted item from receipt."""
@@ -94,19 +139,6 @@ class ReceiptOCR:
         if not self.use_llm:
             self.logger.info("Using regex-based parsing")
 
-        # Common grocery item patterns (used as fallback)
-        self.item_patterns = [
-            # Pattern: ITEM NAME ... $PRICE
-            r"^([\w\s\-']+?)\s+[\.\s]+\s+\$?(\d+\.\d{2})$",
-            # Pattern: ITEM NAME $PRICE
-            r"^([\w\s\-']+?)\s+\$?(\d+\.\d{2})$",
-            # Pattern: QTY ITEM NAME @ PRICE
-            r"^(\d+)\s+([\w\s\-']+?)\s+@\s+\$?(\d+\.\d{2})$",
-        ]
-
-        # Quantity patterns
-        self.quantity_pattern = r"(\d+(?:\.\d+)?)\s*(lb|oz|kg|g|ct|count|gallon|liter)?s?"
-
     def process_receipt(self, image_path: str) -> List[ReceiptItem]:
         """
         Process receipt image and extract items.
@@ -155,15 +187,21 @@ class ReceiptOCR:
         # Convert to grayscale
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
-        # Resize for better OCR (target height ~1200px)
+        # Resize for better OCR (target height ~1200px); large camera images
+        # are shrunk too, since every later step scales with pixel count
         height, width = gray.shape
         if height < 1200:
             scale = 1200 / height
             new_width = int(width * scale)
             gray = cv2.resize(gray, (new_width, 1200), interpolation=cv2.INTER_CUBIC)
+        elif height > 1600:
+            scale = 1200 / height
+            new_width = int(width * scale)
+            gray = cv2.resize(gray, (new_width, 1200), interpolation=cv2.INTER_AREA)
 
-        # Denoise
-        denoised = cv2.fastNlMeansDenoising(gray, h=10)
+        # Denoise (a light separable blur is enough ahead of adaptive
+        # thresholding and is far cheaper than non-local means)
+        denoised = cv2.GaussianBlur(gray, (3, 3), 0)
 
         # Adaptive thresholding
         binary = cv2.adaptiveThreshold(
@@ -175,13 +213,11 @@ class ReceiptOCR:
             2,
         )
 
-        # Deskew if needed
+        # Deskew if needed (the image is already binary, so histogram
+        # equalization afterwards would not change it)
         deskewed = self._deskew(binary)
 
-        # Enhance contrast
-        enhanced = cv2.equalizeHist(deskewed)
-
-        return enhanced
+        return deskewed
 
     def _deskew(self, image: np.ndarray) -> np.ndarray:
         """
@@ -196,37 +232,29 @@ class ReceiptOCR:
         # Detect edges
         edges = cv2.Canny(image, 50, 150, apertureSize=3)
 
-        # Detect lines using Hough transform
-        lines = cv2.HoughLines(edges, 1, np.pi / 180, 200)
-
-        if lines is None:
-            return image
-
-        # Calculate rotation angle
-        angles = []
-        for line in lines:
-            rho, theta = line[0]
-            angle = theta * 180 / np.pi
-            if 85 <= angle <= 95:  # Near vertical lines
-                angles.append(angle - 90)
+        # The minimum-area rectangle around all edge pixels follows the
+        # text block, so its angle is the skew (one pass, unlike Hough)
+        coords = cv2.findNonZero(edges)
 
-        if not angles:
+        if coords is None:
             return image
 
-        # Get median angle
-        median_angle = np.median(angles)
+        # Normalise the rectangle angle to a rotation in [-45, 45) degrees
+        # (OpenCV versions disagree on the range they report)
+        skew_angle = (cv2.minAreaRect(coords)[-1] + 45) % 90 - 45
 
         # Rotate image if angle is significant
-        if abs(median_angle) > 0.5:
+        if abs(skew_angle) > 0.5:
             height, width = image.shape
             center = (width // 2, height // 2)
-            rotation_matrix = cv2.getRotationMatrix2D(center, median_angle, 1.0)
+            rotation_matrix = cv2.getRotationMatrix2D(center, skew_angle, 1.0)
             rotated = cv2.warpAffine(
                 image,
                 rotation_matrix,
                 (width, height),
-                flags=cv2.INTER_CUBIC,
-                borderMode=cv2.BORDER_REPLICATE,
+                flags=cv2.INTER_LINEAR,
+                borderMode=cv2.BORDER_CONSTANT,
+                borderValue=255,  # White, like the thresholded background
             )
             return rotated
 
@@ -342,30 +370,7 @@ class ReceiptOCR:
 
     def _is_header_footer(self, line: str) -> bool:
         """Check if line is likely a header or footer."""
-        lower_line = line.lower()
-
-        # Common header/footer keywords
-        keywords = [
-            "store",
-            "walmart",
-            "target",
-            "kroger",
-            "safeway",
-            "total",
-            "subtotal",
-            "tax",
-            "change",
-            "cash",
-            "credit",
-            "card",
-            "thank you",
-            "receipt",
-            "date",
-            "time",
-            "cashier",
-        ]
-
-        return any(keyword in lower_line for keyword in keywords)
+        return _HEADER_FOOTER_PATTERN.search(line.lower()) is not None
 
     def _extract_item(self, line: str) -> Optional[ReceiptItem]:
         """
@@ -377,9 +382,11 @@ class ReceiptOCR:
         Returns:
             ReceiptItem or None if extraction failed
         """
-        # Try each pattern
-        for pattern in self.item_patterns:
-            match = re.match(pattern, line.strip())
+        # Try each pattern (all of them end in a d.dd price, so lines
+        # without a "." go straight to the fallback)
+        line = line.strip()
+        for pattern in _ITEM_PATTERNS if "." in line else ():
+            match = pattern.match(line)
             if match:
                 groups = match.groups()
 
@@ -401,7 +408,7 @@ class ReceiptOCR:
 
         # Fallback: just extract name if no price found
         # Remove obvious noise
-        cleaned = re.sub(r"[\$\*\#\@]", "", line).strip()
+        cleaned = _NOISE_PATTERN.sub("", line).strip()
         if len(cleaned) > 3 and cleaned.isalnum() or " " in cleaned:
             return ReceiptItem(name=cleaned, confidence=0.5)
 
@@ -417,7 +424,7 @@ class ReceiptOCR:
         Returns:
             Tuple of (quantity, unit, cleaned_name)
         """
-        match = re.search(self.quantity_pattern, item_name, re.IGNORECASE)
+        match = _QTY_PATTERN.search(item_name)
 
         if match:
             qty = float(match.group(1))
@@ -433,6 +440,12 @@ class ReceiptOCR:
         return 1.0, None, item_name
 
 
+@functools.lru_cache(maxsize=1)
+def _default_ocr() -> ReceiptOCR:
+    """Shared pipeline for process_receipt_image (built, with its LLM service, once)."""
+    return ReceiptOCR()
+
+
 def process_receipt_image(image_path: str) -> List[ReceiptItem]:
     """
     Convenience function to process a receipt image.
@@ -443,5 +456,28 @@ def process_receipt_image(image_path: str) -> List[ReceiptItem]:
     Returns:
         List of extracted ReceiptItems
     """
-    ocr = ReceiptOCR()
-    return ocr.process_receipt(image_path)
+    return _default_ocr().process_receipt(image_path)
+
+
+def process_receipt_images(
+    image_paths: List[str], max_workers: Optional[int] = None
+) -> List[List[ReceiptItem]]:
+    """
+    Process several receipt images concurrently.
+
+    Threads are enough here: Tesseract runs as a separate process and
+    OpenCV releases the GIL, so the pipeline (and its LLM service) is
+    shared instead of being rebuilt in worker processes.
+
+    Args:
+        image_paths: Paths to receipt images
+        max_workers: Maximum number of worker threads (default: executor default)
+
+    Returns:
+        Extracted ReceiptItems for each image, in input order
+    """
+    if len(image_paths) <= 1:
+        return [process_receipt_image(path) for path in image_paths]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(process_receipt_image, image_paths))
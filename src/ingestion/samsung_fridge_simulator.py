@@ -20,15 +20,27 @@ import uuid
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 
 from src.utils import get_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
 
 class FridgeMode(Enum):
     """Refrigerator operating modes."""
@@ -51,7 +63,7 @@ class IceMakerStatus(Enum):
     OFF = "off"
 
 
-@dataclass
+@dataclass(slots=True)
 class FridgeItem:
     """Represents an item detected by AI Vision Inside camera."""
     item_id: str
@@ -64,6 +76,39 @@ class FridgeItem:
     category: str
 
 
+def _json(data: Any, status: int = 200) -> Response:
+    """
+    Build a JSON response, encoding with orjson when it is installed.
+
+    Args:
+        data: JSON-serializable payload
+        status: HTTP status code
+
+    Returns:
+        Flask response with an application/json body
+    """
+    if ORJSON_AVAILABLE:
+        return Response(orjson.dumps(data), status=status, mimetype="application/json")
+
+    response = jsonify(data)
+    response.status_code = status
+    return response
+
+
+def _item_to_dict(item: FridgeItem) -> Dict[str, Any]:
+    """Serialize a FridgeItem (all fields are scalars, so no deep copy is needed)."""
+    return {
+        "item_id": item.item_id,
+        "name": item.name,
+        "quantity": item.quantity,
+        "unit": item.unit,
+        "location": item.location,
+        "confidence": item.confidence,
+        "last_seen": item.last_seen,
+        "category": item.category,
+    }
+
+
 @dataclass
 class TemperatureReading:
     """Temperature measurement from fridge sensors."""
@@ -94,6 +139,7 @@ class SamsungFridgeSimulator:
         device_id: Optional[str] = None,
         device_name: str = "Samsung Family Hub",
         port: int = 5001,
+        threads: int = 8,
     ):
         """
         Initialize Samsung fridge simulator.
@@ -102,12 +148,24 @@ class SamsungFridgeSimulator:
             device_id: Unique device identifier (auto-generated if None)
             device_name: Human-readable device name
             port: Port for REST API server
+            threads: Worker threads for the REST API server (waitress)
         """
         self.device_id = device_id or str(uuid.uuid4())
         self.device_name = device_name
         self.port = port
+        self.threads = threads
         self.logger = get_logger("samsung_fridge_sim")
 
+        # Static part of the /api/devices/<id> response
+        self._device_envelope = {
+            "deviceId": self.device_id,
+            "name": self.device_name,
+            "label": self.device_name,
+            "manufacturerName": "Samsung",
+            "presentationId": "samsung-family-hub",
+            "deviceManufacturerCode": "Samsung",
+        }
+
         # Device state
         self.connected = False
         self.mode = FridgeMode.NORMAL
@@ -120,8 +178,23 @@ class SamsungFridgeSimulator:
         self.fridge_temp = TemperatureReading(value=3.2, unit="C")
         self.freezer_temp = TemperatureReading(value=-17.8, unit="C")
 
-        # Inventory (AI Vision Inside)
+        # Guards inventory and device state shared by the Flask request
+        # threads and the background update thread (reentrant because
+        # mutators call each other, e.g. refresh -> _update_temperatures);
+        # callbacks are always invoked after it is released
+        self._lock = threading.RLock()
+
+        # Capabilities payload, rebuilt only after a state change (see
+        # _state_changed and _get_capabilities)
+        self._state_version = 0
+        self._now_iso = datetime.now().isoformat()  # Time of the last state change
+        self._cached_caps: Optional[Dict[str, Any]] = None
+        self._cached_caps_version = -1
+
+        # Inventory (AI Vision Inside), plus a name -> item_id index for the
+        # simulate_* helpers (first item added under a name wins, as before)
         self.inventory: Dict[str, FridgeItem] = {}
+        self._by_name: Dict[str, str] = {}
         self._initialize_sample_inventory()
 
         # Power consumption (watts)
@@ -158,9 +231,10 @@ class SamsungFridgeSimulator:
             {"name": "Eggs Large", "quantity": 2.0, "unit": "dozen", "location": "door", "category": "Protein"},
         ]
 
+        now = datetime.now().isoformat()
         for item in sample_items:
             item_id = str(uuid.uuid4())
-            self.inventory[item_id] = FridgeItem(
+            self._add_to_inventory(FridgeItem(
                 item_id=item_id,
                 name=item["name"],
                 quantity=item["quantity"],
@@ -168,11 +242,27 @@ class SamsungFridgeSimulator:
                 location=item["location"],
                 category=item["category"],
                 confidence=random.uniform(0.85, 0.98),
-                last_seen=datetime.now().isoformat(),
-            )
+                last_seen=now,
+            ))
 
         self.logger.info(f"Initialized with {len(self.inventory)} items")
 
+    def _add_to_inventory(self, item: FridgeItem):
+        """Store an item and index it by name."""
+        self.inventory[item.item_id] = item
+        self._by_name.setdefault(item.name, item.item_id)
+
+    def _remove_from_inventory(self, item_id: str) -> FridgeItem:
+        """Remove an item, re-pointing its name to the next item with that name."""
+        item = self.inventory.pop(item_id)
+        if self._by_name.get(item.name) == item_id:
+            del self._by_name[item.name]
+            for other in self.inventory.values():
+                if other.name == item.name:
+                    self._by_name[item.name] = other.item_id
+                    break
+        return item
+
     def _setup_routes(self):
         """Setup Flask REST API routes (SmartThings compatible)."""
 
@@ -180,15 +270,10 @@ class SamsungFridgeSimulator:
         def get_device_status(device_id):
             """Get complete device status (SmartThings device endpoint)."""
             if device_id != self.device_id:
-                return jsonify({"error": "Device not found"}), 404
-
-            return jsonify({
-                "deviceId": self.device_id,
-                "name": self.device_name,
-                "label": self.device_name,
-                "manufacturerName": "Samsung",
-                "presentationId": "samsung-family-hub",
-                "deviceManufacturerCode": "Samsung",
+                return _json({"error": "Device not found"}, 404)
+
+            return _json({
+                **self._device_envelope,
                 "components": [
                     {
                         "id": "main",
@@ -202,9 +287,9 @@ class SamsungFridgeSimulator:
         def get_status(device_id):
             """Get device status (all capabilities)."""
             if device_id != self.device_id:
-                return jsonify({"error": "Device not found"}), 404
+                return _json({"error": "Device not found"}, 404)
 
-            return jsonify({
+            return _json({
                 "components": {
                     "main": self._get_capabilities()
                 }
@@ -214,7 +299,7 @@ class SamsungFridgeSimulator:
         def execute_command(device_id):
             """Execute device command (SmartThings command endpoint)."""
             if device_id != self.device_id:
-                return jsonify({"error": "Device not found"}), 404
+                return _json({"error": "Device not found"}, 404)
 
             commands = request.json.get("commands", [])
             results = []
@@ -227,13 +312,16 @@ class SamsungFridgeSimulator:
                 result = self._handle_command(capability, command, arguments)
                 results.append(result)
 
-            return jsonify({"results": results})
+            return _json({"results": results})
 
         @self.app.route("/api/inventory", methods=["GET"])
         def get_inventory():
             """Get current inventory (AI Vision Inside)."""
-            items = [asdict(item) for item in self.inventory.values()]
-            return jsonify({
+            with self._lock:
+                snapshot = list(self.inventory.values())
+
+            items = [_item_to_dict(item) for item in snapshot]
+            return _json({
                 "count": len(items),
                 "items": items,
                 "last_updated": datetime.now().isoformat()
@@ -242,50 +330,61 @@ class SamsungFridgeSimulator:
         @self.app.route("/api/inventory/<item_id>", methods=["GET"])
         def get_item(item_id):
             """Get specific inventory item."""
-            if item_id not in self.inventory:
-                return jsonify({"error": "Item not found"}), 404
+            with self._lock:
+                item = self.inventory.get(item_id)
 
-            return jsonify(asdict(self.inventory[item_id]))
+            if item is None:
+                return _json({"error": "Item not found"}, 404)
+
+            return _json(_item_to_dict(item))
 
         @self.app.route("/api/inventory/<item_id>", methods=["PUT"])
         def update_item(item_id):
             """Update inventory item (simulates manual adjustment or removal)."""
-            if item_id not in self.inventory:
-                return jsonify({"error": "Item not found"}), 404
-
             data = request.json
-            item = self.inventory[item_id]
 
-            # Update quantity
-            if "quantity" in data:
-                old_qty = item.quantity
-                item.quantity = data["quantity"]
-                item.last_seen = datetime.now().isoformat()
+            with self._lock:
+                item = self.inventory.get(item_id)
+                if item is None:
+                    return _json({"error": "Item not found"}, 404)
 
-                self.logger.info(
-                    f"Updated {item.name}: {old_qty} -> {item.quantity} {item.unit}"
-                )
+                # Update quantity
+                updated = "quantity" in data
+                if updated:
+                    old_qty = item.quantity
+                    item.quantity = data["quantity"]
+                    item.last_seen = datetime.now().isoformat()
+
+                    self.logger.info(
+                        f"Updated {item.name}: {old_qty} -> {item.quantity} {item.unit}"
+                    )
 
-                # Trigger callback
-                if self.on_inventory_change:
-                    self.on_inventory_change(item_id, asdict(item), "updated")
+                item_data = _item_to_dict(item)
+
+            # Trigger callback
+            if updated and self.on_inventory_change:
+                self.on_inventory_change(item_id, item_data, "updated")
 
-            return jsonify(asdict(item))
+            return _json(item_data)
 
         @self.app.route("/api/inventory/<item_id>", methods=["DELETE"])
         def remove_item(item_id):
             """Remove item from inventory (item consumed or removed)."""
-            if item_id not in self.inventory:
-                return jsonify({"error": "Item not found"}), 404
+            with self._lock:
+                if item_id not in self.inventory:
+                    return _json({"error": "Item not found"}, 404)
+
+                item = self._remove_from_inventory(item_id)
+                self._state_changed()
 
-            item = self.inventory.pop(item_id)
             self.logger.info(f"Removed item: {item.name}")
+            item_data = _item_to_dict(item)
 
             # Trigger callback
             if self.on_inventory_change:
-                self.on_inventory_change(item_id, asdict(item), "removed")
+                self.on_inventory_change(item_id, item_data, "removed")
 
-            return jsonify({"message": "Item removed", "item": asdict(item)})
+            return _json({"message": "Item removed", "item": item_data})
 
         @self.app.route("/api/inventory", methods=["POST"])
         def add_item():
@@ -304,14 +403,17 @@ class SamsungFridgeSimulator:
                 last_seen=datetime.now().isoformat(),
             )
 
-            self.inventory[item_id] = item
+            with self._lock:
+                self._add_to_inventory(item)
+                self._state_changed()
+
             self.logger.info(f"Added item: {item.name} ({item.quantity} {item.unit})")
 
             # Trigger callback
             if self.on_inventory_change:
-                self.on_inventory_change(item_id, asdict(item), "added")
+                self.on_inventory_change(item_id, _item_to_dict(item), "added")
 
-            return jsonify(asdict(item)), 201
+            return _json(_item_to_dict(item), 201)
 
         @self.app.route("/api/door", methods=["POST"])
         def simulate_door():
@@ -324,69 +426,84 @@ class SamsungFridgeSimulator:
             elif action == "close":
                 self._close_door()
             else:
-                return jsonify({"error": "Invalid action. Use 'open' or 'close'"}), 400
+                return _json({"error": "Invalid action. Use 'open' or 'close'"}, 400)
 
-            return jsonify({"door_status": self.door_status.value})
+            return _json({"door_status": self.door_status.value})
 
         @self.app.route("/api/health", methods=["GET"])
         def health_check():
             """Health check endpoint."""
-            return jsonify({
+            return _json({
                 "status": "ok",
                 "device_id": self.device_id,
                 "connected": self.connected,
                 "uptime_seconds": time.time() - self._start_time if hasattr(self, '_start_time') else 0
             })
 
+    def _state_changed(self):
+        """Invalidate the cached capabilities and stamp the time of the change."""
+        self._state_version += 1
+        self._now_iso = datetime.now().isoformat()
+
     def _get_capabilities(self) -> Dict[str, Any]:
         """Get current device capabilities and states (SmartThings format)."""
-        return {
-            "temperatureMeasurement": {
-                "temperature": {
-                    "value": self.fridge_temp.value,
-                    "unit": self.fridge_temp.unit,
-                    "timestamp": self.fridge_temp.timestamp
-                }
-            },
-            "custom.freezerTemperature": {
-                "temperature": {
-                    "value": self.freezer_temp.value,
-                    "unit": self.freezer_temp.unit,
-                    "timestamp": self.freezer_temp.timestamp
-                }
-            },
-            "contactSensor": {
-                "contact": {
-                    "value": self.door_status.value,
-                    "timestamp": datetime.now().isoformat()
-                }
-            },
-            "custom.fridgeMode": {
-                "mode": {
-                    "value": self.mode.value,
-                    "timestamp": datetime.now().isoformat()
-                }
-            },
-            "custom.iceMaker": {
-                "status": {
-                    "value": self.ice_maker_status.value,
-                    "timestamp": datetime.now().isoformat()
-                }
-            },
-            "powerConsumptionReport": {
-                "powerConsumption": {
-                    "value": self.power_consumption,
-                    "unit": "W",
-                    "timestamp": datetime.now().isoformat()
-                }
-            },
-            "custom.aiVisionInside": {
-                "inventoryCount": {
-                    "value": len(self.inventory),
-                    "timestamp": datetime.now().isoformat()
+        with self._lock:
+            version = self._state_version
+            if self._cached_caps_version == version:
+                return self._cached_caps
+
+            now = self._now_iso
+            capabilities = {
+                "temperatureMeasurement": {
+                    "temperature": {
+                        "value": self.fridge_temp.value,
+                        "unit": self.fridge_temp.unit,
+                        "timestamp": self.fridge_temp.timestamp
+                    }
+                },
+                "custom.freezerTemperature": {
+                    "temperature": {
+                        "value": self.freezer_temp.value,
+                        "unit": self.freezer_temp.unit,
+                        "timestamp": self.freezer_temp.timestamp
+                    }
+                },
+                "contactSensor": {
+                    "contact": {
+                        "value": self.door_status.value,
+                        "timestamp": now
+                    }
+                },
+                "custom.fridgeMode": {
+                    "mode": {
+                        "value": self.mode.value,
+                        "timestamp": now
+                    }
+                },
+                "custom.iceMaker": {
+                    "status": {
+                        "value": self.ice_maker_status.value,
+                        "timestamp": now
+                    }
+                },
+                "powerConsumptionReport": {
+                    "powerConsumption": {
+                        "value": self.power_consumption,
+                        "unit": "W",
+                        "timestamp": now
+                    }
+                },
+                "custom.aiVisionInside": {
+                    "inventoryCount": {
+                        "value": len(self.inventory),
+                        "timestamp": now
+                    }
                 }
             }
-        }
+            self._cached_caps = capabilities
+            self._cached_caps_version = version
+
+            return capabilities
 
     def _handle_command(
         self,
@@ -401,7 +518,9 @@ class SamsungFridgeSimulator:
             if command == "setMode":
                 try:
                     mode = FridgeMode(arguments[0])
-                    self.mode = mode
+                    with self._lock:
+                        self.mode = mode
+                        self._state_changed()
                     return {"status": "success", "mode": mode.value}
                 except ValueError:
                     return {"status": "error", "message": "Invalid mode"}
@@ -415,18 +534,24 @@ class SamsungFridgeSimulator:
 
     def _open_door(self):
         """Simulate door opening."""
-        self.door_status = DoorStatus.OPEN
-        self.logger.info("Door OPENED")
+        with self._lock:
+            self.door_status = DoorStatus.OPEN
+
+            # Temperature rises when door is open
+            self.fridge_temp.value += random.uniform(0.5, 1.5)
+            self._state_changed()
 
-        # Temperature rises when door is open
-        self.fridge_temp.value += random.uniform(0.5, 1.5)
+        self.logger.info("Door OPENED")
 
         if self.on_door_open:
             self.on_door_open()
 
     def _close_door(self):
         """Simulate door closing."""
-        self.door_status = DoorStatus.CLOSED
+        with self._lock:
+            self.door_status = DoorStatus.CLOSED
+            self._state_changed()
+
         self.logger.info("Door CLOSED")
 
         if self.on_door_close:
@@ -434,19 +559,21 @@ class SamsungFridgeSimulator:
 
     def _update_temperatures(self):
         """Update temperature readings (simulates sensor drift)."""
-        # Fridge temperature fluctuates slightly
-        if self.door_status == DoorStatus.CLOSED:
-            self.fridge_temp.value = self.fridge_temp_setpoint + random.uniform(-0.5, 0.5)
-            self.freezer_temp.value = self.freezer_temp_setpoint + random.uniform(-1.0, 1.0)
-        else:
-            # Door open - temperature rises
-            self.fridge_temp.value = min(
-                self.fridge_temp.value + random.uniform(0.2, 0.5),
-                15.0  # Max temp
-            )
+        with self._lock:
+            # Fridge temperature fluctuates slightly
+            if self.door_status == DoorStatus.CLOSED:
+                self.fridge_temp.value = self.fridge_temp_setpoint + random.uniform(-0.5, 0.5)
+                self.freezer_temp.value = self.freezer_temp_setpoint + random.uniform(-1.0, 1.0)
+            else:
+                # Door open - temperature rises
+                self.fridge_temp.value = min(
+                    self.fridge_temp.value + random.uniform(0.2, 0.5),
+                    15.0  # Max temp
+                )
 
-        self.fridge_temp.timestamp = datetime.now().isoformat()
-        self.freezer_temp.timestamp = datetime.now().isoformat()
+            self._state_changed()
+            self.fridge_temp.timestamp = self._now_iso
+            self.freezer_temp.timestamp = self._now_iso
 
     def _background_updates(self):
         """Background thread for periodic state updates."""
@@ -478,8 +605,13 @@ class SamsungFridgeSimulator:
         self.logger.info(f"Device ID: {self.device_id}")
         self.logger.info(f"Inventory: {len(self.inventory)} items")
 
-        # Run Flask app
-        self.app.run(host="0.0.0.0", port=self.port, debug=False)
+        # Run REST API on waitress's thread pool when installed, otherwise
+        # fall back to the (threaded) Flask development server
+        if WAITRESS_AVAILABLE:
+            serve(self.app, host="0.0.0.0", port=self.port, threads=self.threads)
+        else:
+            self.logger.warning("waitress not installed, using Flask development server")
+            self.app.run(host="0.0.0.0", port=self.port, debug=False, threaded=True)
 
     def stop(self):
         """Stop the simulator."""
@@ -489,70 +621,83 @@ class SamsungFridgeSimulator:
 
     def get_inventory_snapshot(self) -> List[Dict[str, Any]]:
         """Get current inventory as list of dicts."""
-        return [asdict(item) for item in self.inventory.values()]
+        with self._lock:
+            snapshot = list(self.inventory.values())
+
+        return [_item_to_dict(item) for item in snapshot]
 
     def simulate_item_removal(self, item_name: str, quantity: float):
         """Simulate removing quantity from an item."""
-        for item_id, item in self.inventory.items():
-            if item.name == item_name:
-                old_qty = item.quantity
-                item.quantity = max(0, item.quantity - quantity)
-                item.last_seen = datetime.now().isoformat()
+        with self._lock:
+            item_id = self._by_name.get(item_name)
+            if item_id is None:
+                return
 
-                self.logger.info(
-                    f"Removed {quantity} {item.unit} from {item_name}: "
-                    f"{old_qty} -> {item.quantity}"
-                )
+            item = self.inventory[item_id]
+            old_qty = item.quantity
+            item.quantity = max(0, item.quantity - quantity)
+            item.last_seen = datetime.now().isoformat()
+
+            # Remove item if quantity is 0
+            depleted = item.quantity == 0
+            if depleted:
+                self._remove_from_inventory(item_id)
+                self._state_changed()
+
+            item_data = _item_to_dict(item)
 
-                # Remove item if quantity is 0
-                if item.quantity == 0:
-                    del self.inventory[item_id]
-                    self.logger.info(f"Item {item_name} depleted and removed")
+        self.logger.info(
+            f"Removed {quantity} {item.unit} from {item_name}: "
+            f"{old_qty} -> {item_data['quantity']}"
+        )
 
-                    if self.on_inventory_change:
-                        self.on_inventory_change(item_id, asdict(item), "removed")
-                else:
-                    if self.on_inventory_change:
-                        self.on_inventory_change(item_id, asdict(item), "updated")
+        if depleted:
+            self.logger.info(f"Item {item_name} depleted and removed")
 
-                break
+        if self.on_inventory_change:
+            self.on_inventory_change(item_id, item_data, "removed" if depleted else "updated")
 
     def simulate_item_addition(self, name: str, quantity: float, unit: str, category: str = "Other"):
         """Simulate adding a new item or increasing existing item quantity."""
-        # Check if item already exists
-        for item in self.inventory.values():
-            if item.name == name:
+        with self._lock:
+            # Check if item already exists
+            item_id = self._by_name.get(name)
+            existing = item_id is not None
+
+            if existing:
+                item = self.inventory[item_id]
                 old_qty = item.quantity
                 item.quantity += quantity
                 item.last_seen = datetime.now().isoformat()
-
-                self.logger.info(
-                    f"Added {quantity} {unit} to {name}: "
-                    f"{old_qty} -> {item.quantity}"
+            else:
+                # Create new item
+                item_id = str(uuid.uuid4())
+                item = FridgeItem(
+                    item_id=item_id,
+                    name=name,
+                    quantity=quantity,
+                    unit=unit,
+                    location="upper_shelf",
+                    category=category,
+                    confidence=0.92,
+                    last_seen=datetime.now().isoformat(),
                 )
 
-                if self.on_inventory_change:
-                    self.on_inventory_change(item.item_id, asdict(item), "updated")
-                return
+                self._add_to_inventory(item)
+                self._state_changed()
 
-        # Create new item
-        item_id = str(uuid.uuid4())
-        item = FridgeItem(
-            item_id=item_id,
-            name=name,
-            quantity=quantity,
-            unit=unit,
-            location="upper_shelf",
-            category=category,
-            confidence=0.92,
-            last_seen=datetime.now().isoformat(),
-        )
+            item_data = _item_to_dict(item)
 
-        self.inventory[item_id] = item
-        self.logger.info(f"Added new item: {name} ({quantity} {unit})")
+        if existing:
+            self.logger.info(
+                f"Added {quantity} {unit} to {name}: "
+                f"{old_qty} -> {item_data['quantity']}"
+            )
+        else:
+            self.logger.info(f"Added new item: {name} ({quantity} {unit})")
 
         if self.on_inventory_change:
-            self.on_inventory_change(item_id, asdict(item), "added")
+            self.on_inventory_change(item_id, item_data, "updated" if existing else "added")
 
 
 def main():
@@ -334,8 +334,12 @@ class P3EdgeApplication:
             except Exception as e:
                 self.logger.error(f"Failed to save models on shutdown: {e}")
 
-        # Close database
+        # Refresh planner statistics and close database
         if self.db_manager:
+            try:
+                self.db_manager.optimize()
+            except Exception as e:
+                self.logger.error(f"Failed to optimize database on shutdown: {e}")
             self.db_manager.close()
 
         self.logger.info("Application shutdown complete")
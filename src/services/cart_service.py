@@ -6,6 +6,7 @@ Handles cart creation, item management, order placement, and spend cap enforceme
 
 import uuid
 from datetime import datetime
+from itertools import islice
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
@@ -402,8 +403,10 @@ class CartService:
             List of pending orders
         """
         try:
-            all_orders = self.db_manager.get_all_orders()
-            pending = [o for o in all_orders if o.status == OrderStatus.PENDING_APPROVAL]
+            pending = [
+                o for o in self.db_manager.iter_orders()
+                if o.status == OrderStatus.PENDING_APPROVAL
+            ]
             return pending
         except Exception as e:
             self.logger.error(f"Error getting pending orders: {e}")
@@ -420,10 +423,8 @@ class CartService:
             List of orders
         """
         try:
-            orders = self.db_manager.get_all_orders()
-            # Sort by created_at descending
-            orders.sort(key=lambda o: o.created_at, reverse=True)
-            return orders[:limit]
+            # Orders are streamed newest first, so only read what we need
+            return list(islice(self.db_manager.iter_orders(), limit))
         except Exception as e:
             self.logger.error(f"Error getting order history: {e}")
             return []
@@ -87,6 +87,92 @@ class InventoryService:
         self.logger.info(f"Created inventory item: {item.name} ({item.item_id})")
         return item.item_id
 
+    def create_items(self, items: List[InventoryItem], source: str = "manual") -> int:
+        """
+        Create several inventory items in a single transaction.
+
+        Inventory and history rows are written with executemany so a batch
+        costs one round-trip instead of one per item.
+
+        Args:
+            items: InventoryItems to create
+            source: Source recorded in the initial history entries
+
+        Returns:
+            Number of items created
+        """
+        if not items:
+            return 0
+
+        item_query = """
+            INSERT INTO inventory (
+                item_id, name, category, brand, unit,
+                quantity_current, quantity_min, quantity_max,
+                last_updated, location, perishable, expiry_date,
+                consumption_rate, metadata, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        history_query = """
+            INSERT INTO inventory_history
+            (history_id, item_id, quantity, timestamp, source, notes)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """
+
+        item_params = []
+        history_params = []
+        for item in items:
+            item_params.append(
+                (
+                    item.item_id,
+                    item.name,
+                    item.category,
+                    item.brand,
+                    item.unit,
+                    item.quantity_current,
+                    item.quantity_min,
+                    item.quantity_max,
+                    item.last_updated.isoformat(),
+                    item.location,
+                    1 if item.perishable else 0,
+                    item.expiry_date.isoformat() if item.expiry_date else None,
+                    item.consumption_rate,
+                    json.dumps(item.metadata),
+                    item.created_at.isoformat(),
+                )
+            )
+            history = InventoryHistory(
+                item_id=item.item_id,
+                quantity=item.quantity_current,
+                source=source,
+                notes="Initial creation",
+            )
+            history_params.append(
+                (
+                    history.history_id,
+                    history.item_id,
+                    history.quantity,
+                    history.timestamp.isoformat(),
+                    history.source,
+                    history.notes,
+                )
+            )
+
+        with self.db_manager.get_connection() as conn:
+            conn.executemany(item_query, item_params)
+            conn.executemany(history_query, history_params)
+
+        # Log to audit trail, one entry per item as in create_item
+        for item in items:
+            self.audit_logger.log_action(
+                action_type="inventory_created",
+                actor=source,
+                details={"item_id": item.item_id, "name": item.name},
+                item_id=item.item_id,
+            )
+
+        self.logger.info(f"Created {len(items)} inventory items")
+        return len(items)
+
     def get_item(self, item_id: str) -> Optional[InventoryItem]:
         """
         Get an inventory item by ID.
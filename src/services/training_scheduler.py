@@ -167,6 +167,12 @@ class TrainingScheduler:
                 },
             )
 
+        # Nightly database maintenance while usage is low
+        try:
+            self.db_manager.optimize()
+        except Exception as e:
+            self.logger.error(f"Scheduled database optimize failed: {e}")
+
     def get_next_run_time(self) -> Optional[datetime]:
         """
         Get the next scheduled run time.
@@ -341,8 +341,18 @@ class GetOrderHistoryTool(BaseTool):
     ) -> List[Dict[str, Any]]:
         """Execute query."""
         query = """
-            SELECT order_id, vendor, status, items, total_cost,
-                   created_at, placed_at, delivered_at
+            SELECT order_id, vendor, status, total_cost,
+                   created_at, placed_at, delivered_at,
+                   (
+                       SELECT json_group_array(json_object(
+                           'item_id', i.item_id, 'product_id', i.product_id,
+                           'name', i.name, 'quantity', i.quantity, 'price', i.price
+                       ))
+                       FROM (
+                           SELECT * FROM order_items
+                           WHERE order_id = orders.order_id ORDER BY idx
+                       ) i
+                   ) AS items
             FROM orders
             WHERE 1=1
         """
@@ -403,7 +413,17 @@ class GetPendingOrdersTool(BaseTool):
     def execute(self) -> List[Dict[str, Any]]:
         """Execute query."""
         query = """
-            SELECT order_id, vendor, items, total_cost, created_at
+            SELECT order_id, vendor, total_cost, created_at,
+                   (
+                       SELECT json_group_array(json_object(
+                           'item_id', i.item_id, 'product_id', i.product_id,
+                           'name', i.name, 'quantity', i.quantity, 'price', i.price
+                       ))
+                       FROM (
+                           SELECT * FROM order_items
+                           WHERE order_id = orders.order_id ORDER BY idx
+                       ) i
+                   ) AS items
             FROM orders
             WHERE status = 'PENDING_APPROVAL'
             ORDER BY created_at DESC
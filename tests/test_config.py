@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for configuration import/export.
+
+Checks that import_config applies a valid file and leaves the current
+configuration untouched when the file is malformed.
+
+Run with: python tests/test_config.py
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.config_manager import ConfigManager
+
+
+def test_import_config_round_trip():
+    """Exported config and credentials import into a fresh manager."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = ConfigManager(config_dir=str(Path(tmp) / "source"))
+        source.set("ui.theme", "dark")
+        source.set_credential("amazon_api_key", "secret")
+
+        export_path = str(Path(tmp) / "export.json")
+        source.export_config(export_path, include_credentials=True)
+
+        target = ConfigManager(config_dir=str(Path(tmp) / "target"))
+        target.import_config(export_path)
+        assert target.get("ui.theme") == "dark"
+        assert target.get_credential("amazon_api_key") == "secret"
+
+        # The imported values were saved, not just held in memory
+        reloaded = ConfigManager(config_dir=str(Path(tmp) / "target"))
+        assert reloaded.get("ui.theme") == "dark"
+        assert reloaded.get_credential("amazon_api_key") == "secret"
+
+
+def test_import_config_rejects_malformed_section():
+    """A bad section aborts the import before anything is applied."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ConfigManager(config_dir=str(Path(tmp) / "config"))
+        manager.set("ui.theme", "light")
+        manager.set_credential("amazon_api_key", "original")
+
+        # Valid config section followed by a credentials section of the
+        # wrong type
+        bad_section = Path(tmp) / "bad_section.json"
+        bad_section.write_text(json.dumps({
+            "config": {"ui": {"theme": "dark"}},
+            "credentials": ["not", "an", "object"],
+        }))
+
+        # Valid config section followed by broken JSON
+        bad_json = Path(tmp) / "bad_json.json"
+        bad_json.write_text('{"config": {"ui": {"theme": "dark"}}, "credentials": {')
+
+        # Trailing garbage after the closing brace
+        trailing = Path(tmp) / "trailing.json"
+        trailing.write_text('{"config": {"ui": {"theme": "dark"}}} garbage')
+
+        for path, error in [
+            (bad_section, ValueError),
+            (bad_json, json.JSONDecodeError),
+            (trailing, json.JSONDecodeError),
+        ]:
+            try:
+                manager.import_config(str(path))
+            except error:
+                pass
+            else:
+                raise AssertionError(f"{path.name} was imported")
+
+            reloaded = ConfigManager(config_dir=str(Path(tmp) / "config"))
+            for config in (manager, reloaded):
+                assert config.get("ui.theme") == "light", path.name
+                assert config.get_credential("amazon_api_key") == "original", path.name
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_import_config_round_trip,
+        test_import_config_rejects_malformed_section,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e!r}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
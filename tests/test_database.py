@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Test script for the database manager.
+
+Covers the connection pool, order storage in the order_items table
+(including migrating a database that still has the JSON orders.items
+column) and backups. Runs against a temporary unencrypted database.
+
+Run with: python tests/test_database.py
+"""
+
+import json
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.db_manager import DatabaseManager
+from src.models.order import Order, OrderItem, OrderStatus, Vendor
+
+# orders table as created before line items moved to order_items
+LEGACY_ORDERS_SQL = """
+    CREATE TABLE orders (
+        order_id TEXT PRIMARY KEY,
+        vendor TEXT NOT NULL,
+        status TEXT NOT NULL,
+        items TEXT NOT NULL,
+        total_cost REAL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        approved_at DATETIME,
+        placed_at DATETIME,
+        delivered_at DATETIME,
+        user_notes TEXT,
+        auto_generated INTEGER DEFAULT 1,
+        vendor_order_id TEXT
+    );
+    CREATE INDEX idx_orders_status ON orders(status);
+"""
+
+
+def make_order(order_id: str) -> Order:
+    """Build an order with three items."""
+    return Order(
+        order_id=order_id,
+        vendor=Vendor.AMAZON,
+        items=[
+            OrderItem(item_id="milk", product_id="B001", name="Milk",
+                      quantity=2.0, price=3.49, unit="gallon", brand="Organic Valley"),
+            OrderItem(item_id="eggs", name="Eggs", quantity=1.0, price=4.99, unit="dozen"),
+            OrderItem(item_id="bread", name="Bread", quantity=1.0, price=2.5),
+        ],
+        total_cost=14.47,
+        created_at=datetime(2025, 3, 1, 9, 30),
+        user_notes="weekly",
+    )
+
+
+def test_pool_reuse_and_close():
+    """Pooled connections are reused, capped and closed by close()."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / "pool.db"), min_pool_size=1, max_pool_size=2)
+
+        with db.get_connection() as conn:
+            first = conn
+        with db.get_connection() as conn:
+            assert conn is first, "idle connection was not reused"
+
+        # Two connections in use at once, both returned to the pool
+        with db.get_connection() as conn_a, db.get_connection() as conn_b:
+            assert conn_a is not conn_b
+        assert db._pool_created == 2
+        assert db._pool.qsize() == 2
+
+        db.close()
+        assert db._pool_created == 0
+        assert db._pool.qsize() == 0
+
+        # The manager stays usable after close()
+        assert db.execute_query("SELECT 1")[0][0] == 1
+        db.close()
+
+
+def test_order_round_trip():
+    """Orders come back with the same items, in order, after create/update."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / "orders.db"))
+        db.initialize_database()
+
+        order = make_order("order-1")
+        db.create_order(order)
+
+        loaded = db.get_order("order-1")
+        assert loaded is not None
+        assert loaded.items == order.items
+        assert loaded.vendor == Vendor.AMAZON
+        assert loaded.status == OrderStatus.PENDING_APPROVAL
+        assert loaded.created_at == order.created_at
+        assert loaded.user_notes == "weekly"
+
+        # update_order replaces the items
+        order.remove_item("eggs")
+        order.approve()
+        db.update_order(order)
+        loaded = db.get_order("order-1")
+        assert [item.item_id for item in loaded.items] == ["milk", "bread"]
+        assert loaded.status == OrderStatus.APPROVED
+
+        # Deleting an order cascades to its items
+        db.create_orders([make_order("order-2")])
+        assert sorted(o.order_id for o in db.get_all_orders()) == ["order-1", "order-2"]
+        db.execute_update("DELETE FROM orders WHERE order_id = ?", ("order-2",))
+        assert db.execute_query(
+            "SELECT COUNT(*) FROM order_items WHERE order_id = ?", ("order-2",)
+        )[0][0] == 0
+
+        assert db.get_order("missing") is None
+        db.close()
+
+
+def test_legacy_order_items_migration():
+    """initialize_database moves orders.items JSON into order_items."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "legacy.db")
+        items = [
+            {"item_id": "milk", "name": "Milk", "quantity": 2.0, "price": 3.49, "unit": "gallon"},
+            {"item_id": "eggs", "name": "Eggs", "quantity": 1.0, "price": 4.99},
+        ]
+
+        conn = sqlite3.connect(db_path)
+        conn.executescript(LEGACY_ORDERS_SQL)
+        conn.execute(
+            "INSERT INTO orders (order_id, vendor, status, items, total_cost, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            ("legacy-1", "amazon", "delivered", json.dumps(items), 11.97, "2024-12-24T10:00:00"),
+        )
+        conn.commit()
+        conn.close()
+
+        db = DatabaseManager(db_path)
+        db.initialize_database()
+        assert "items" not in db.get_column_names("orders")
+
+        loaded = db.get_order("legacy-1")
+        assert [item.item_id for item in loaded.items] == ["milk", "eggs"]
+        assert loaded.items[0].unit == "gallon"
+        assert loaded.status == OrderStatus.DELIVERED
+
+        # New orders can be written after the upgrade, and a second
+        # initialize_database leaves everything in place
+        db.create_order(make_order("order-1"))
+        db.initialize_database()
+        assert len(db.get_all_orders()) == 2
+        assert db.execute_query("PRAGMA foreign_keys")[0][0] == 1
+        db.close()
+
+
+def test_legacy_order_items_migration_rejects_bad_rows():
+    """Unconvertible legacy items abort the migration and keep the column."""
+    good = json.dumps([{"item_id": "milk", "name": "Milk", "quantity": 1.0, "price": 3.49}])
+    bad_rows = [
+        "not json",
+        json.dumps(["milk"]),
+        # Missing the required price
+        json.dumps([{"item_id": "milk", "name": "Milk", "quantity": 1.0}]),
+    ]
+
+    for bad in bad_rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = str(Path(tmp) / "legacy.db")
+            conn = sqlite3.connect(db_path)
+            conn.executescript(LEGACY_ORDERS_SQL)
+            conn.executemany(
+                "INSERT INTO orders (order_id, vendor, status, items) VALUES (?, ?, ?, ?)",
+                [("good", "amazon", "delivered", good), ("bad", "amazon", "delivered", bad)],
+            )
+            conn.commit()
+            conn.close()
+
+            db = DatabaseManager(db_path)
+            try:
+                db.initialize_database()
+            except (ValueError, sqlite3.IntegrityError):
+                pass
+            else:
+                raise AssertionError(f"migrated {bad!r}")
+
+            # Nothing was moved and the legacy data is intact
+            assert "items" in db.get_column_names("orders"), bad
+            assert db.execute_query("SELECT COUNT(*) FROM order_items")[0][0] == 0, bad
+            rows = db.execute_query("SELECT order_id, items FROM orders ORDER BY order_id")
+            assert [tuple(row) for row in rows] == [("bad", bad), ("good", good)], bad
+            assert db.execute_query("PRAGMA foreign_keys")[0][0] == 1
+            db.close()
+
+
+def test_backup_round_trip():
+    """A backup opens with the same settings and holds the same orders."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / "live.db"))
+        db.initialize_database()
+        db.create_order(make_order("order-1"))
+
+        backup_path = str(Path(tmp) / "backup.db")
+        db.backup(backup_path)
+        db.close()
+
+        restored = DatabaseManager(backup_path)
+        assert restored.get_order("order-1").items == make_order("order-1").items
+        restored.close()
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_pool_reuse_and_close,
+        test_order_round_trip,
+        test_legacy_order_items_migration,
+        test_legacy_order_items_migration_rejects_bad_rows,
+        test_backup_round_trip,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e!r}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
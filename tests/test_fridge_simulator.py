@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for the Samsung fridge simulator's inventory handling.
+
+Drives the REST API through Flask's test client (no server is started)
+and checks that the name index used by the simulate_* helpers follows
+deletes and re-adds.
+
+Run with: python tests/test_fridge_simulator.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ingestion.samsung_fridge_simulator import SamsungFridgeSimulator
+
+
+def items_named(simulator: SamsungFridgeSimulator, name: str) -> list:
+    """Inventory snapshot entries with the given name."""
+    return [item for item in simulator.get_inventory_snapshot() if item["name"] == name]
+
+
+def test_name_index_after_delete_and_readd():
+    """simulate_* helpers find the right item after deletes and re-adds."""
+    simulator = SamsungFridgeSimulator(device_id="test-fridge")
+    client = simulator.app.test_client()
+
+    # Two items share a name; the first one added is the one updated
+    first = client.post("/api/inventory", json={"name": "Kombucha", "quantity": 1.0}).get_json()
+    second = client.post("/api/inventory", json={"name": "Kombucha", "quantity": 5.0}).get_json()
+
+    simulator.simulate_item_addition("Kombucha", 1.0, "count")
+    assert simulator.inventory[first["item_id"]].quantity == 2.0
+    assert simulator.inventory[second["item_id"]].quantity == 5.0
+
+    # Deleting the first re-points the name to the second
+    response = client.delete(f"/api/inventory/{first['item_id']}")
+    assert response.status_code == 200
+    simulator.simulate_item_removal("Kombucha", 2.0)
+    assert simulator.inventory[second["item_id"]].quantity == 3.0
+
+    # Depleting the last one drops the name; adding it again creates a new item
+    simulator.simulate_item_removal("Kombucha", 3.0)
+    assert items_named(simulator, "Kombucha") == []
+    assert "Kombucha" not in simulator._by_name
+
+    simulator.simulate_item_addition("Kombucha", 4.0, "count", category="Beverages")
+    readded = items_named(simulator, "Kombucha")
+    assert len(readded) == 1
+    assert readded[0]["item_id"] not in (first["item_id"], second["item_id"])
+    assert readded[0]["quantity"] == 4.0
+
+    # Unknown names are ignored
+    simulator.simulate_item_removal("Dragon Fruit", 1.0)
+    assert items_named(simulator, "Dragon Fruit") == []
+
+
+def test_inventory_events():
+    """Inventory callbacks report added/updated/removed events."""
+    simulator = SamsungFridgeSimulator(device_id="test-fridge")
+    events = []
+    simulator.on_inventory_change = lambda item_id, data, event: events.append(
+        (data["name"], event, data["quantity"])
+    )
+
+    simulator.simulate_item_addition("Oat Milk", 2.0, "carton")
+    simulator.simulate_item_addition("Oat Milk", 1.0, "carton")
+    simulator.simulate_item_removal("Oat Milk", 3.0)
+
+    assert events == [
+        ("Oat Milk", "added", 2.0),
+        ("Oat Milk", "updated", 3.0),
+        ("Oat Milk", "removed", 0),
+    ]
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_name_index_after_delete_and_readd,
+        test_inventory_events,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e!r}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk inventory creation.
+
+Checks that InventoryService.create_items stores items, history and audit
+entries the same way create_item does, and that confirming receipt items
+through the phone app API reports invalid items instead of failing.
+
+Run with: python tests/test_inventory_service.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.db_manager import DatabaseManager
+from src.models import InventoryItem
+from src.services.inventory_service import InventoryService
+
+
+def make_service(tmp: str) -> InventoryService:
+    """Inventory service on a fresh temporary database."""
+    db = DatabaseManager(str(Path(tmp) / "inventory.db"))
+    db.initialize_database()
+    return InventoryService(db)
+
+
+def audit_entries(service: InventoryService, item_id: str) -> list:
+    """Audit log action types recorded for an item."""
+    rows = service.db_manager.execute_query(
+        "SELECT action_type FROM audit_log WHERE item_id = ?", (item_id,)
+    )
+    return [row[0] for row in rows]
+
+
+def test_create_items_matches_create_item():
+    """Bulk-created items have the same rows and audit trail as single ones."""
+    with tempfile.TemporaryDirectory() as tmp:
+        service = make_service(tmp)
+
+        single = InventoryItem(name="Milk", unit="gallon", quantity_current=1.0)
+        service.create_item(single)
+
+        batch = [
+            InventoryItem(name="Eggs", unit="dozen", quantity_current=2.0),
+            InventoryItem(name="Bread", quantity_current=1.0, perishable=True),
+        ]
+        assert service.create_items(batch, source="receipt") == 2
+        assert service.create_items([]) == 0
+
+        for item in [single, *batch]:
+            loaded = service.get_item(item.item_id)
+            assert loaded is not None, item.name
+            assert loaded.name == item.name
+            assert loaded.unit == item.unit
+            assert loaded.quantity_current == item.quantity_current
+
+            history = service.db_manager.execute_query(
+                "SELECT quantity FROM inventory_history WHERE item_id = ?", (item.item_id,)
+            )
+            assert [row[0] for row in history] == [item.quantity_current], item.name
+
+            # Each item's audit trail can be found by its item_id
+            assert audit_entries(service, item.item_id) == ["inventory_created"], item.name
+
+        sources = service.db_manager.execute_query(
+            "SELECT source FROM inventory_history WHERE item_id = ?", (batch[0].item_id,)
+        )
+        assert sources[0][0] == "receipt"
+        service.db_manager.close()
+
+
+def test_confirm_receipt_items_reports_invalid_items():
+    """Invalid receipt items are reported; the valid ones are still added."""
+    from fastapi.testclient import TestClient
+
+    from src.api import phone_app
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = make_service(tmp)
+        phone_app.init_api(service, upload_dir=str(Path(tmp) / "receipts"))
+        client = TestClient(phone_app.app)
+
+        items = [
+            {"name": "Apples", "quantity": 6, "unit": "count", "price": 3.5},
+            {"quantity": 1, "unit": "count"},
+            {"name": "Flour", "quantity": 1, "unit": "x" * 21},
+            {"name": "Butter", "quantity": 1},
+        ]
+        response = client.post(
+            "/upload/receipt/confirm", params={"receipt_id": "r-1"}, json=items
+        )
+        assert response.status_code == 200, response.text
+
+        result = response.json()
+        assert result["status"] == "partial"
+        assert result["items_added"] == 2
+        assert [entry["index"] for entry in result["items_rejected"]] == [1, 2]
+
+        names = sorted(item.name for item in service.get_all_items())
+        assert names == ["Apples", "Butter"]
+        service.db_manager.close()
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_create_items_matches_create_item,
+        test_confirm_receipt_items_reports_invalid_items,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e!r}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Test script for the batched forecasting paths.
+
+Checks that the batched helpers give the same results as their
+one-at-a-time counterparts:
+1. extract_features_batch vs extract_features
+2. OnlineForecastTrainer.update_models_batch vs update_model
+3. Saving all models to the sharded checkpoint and loading them back
+4. Retraining (ConsumptionForecaster.update_batch) vs a per-observation
+   update() replay of the same history
+
+Run with: python tests/test_online_trainer.py
+"""
+
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import torch
+
+from src.forecasting.online_trainer import OnlineForecastTrainer
+from src.forecasting.state_space_model import (
+    ConsumptionForecaster,
+    extract_features,
+    extract_features_batch,
+)
+
+ITEMS = {
+    "milk": {
+        "name": "Milk",
+        "category": "dairy",
+        "quantity_current": 2.0,
+        "perishable": True,
+        "expiry_date": (date.today() + timedelta(days=6)).isoformat(),
+        "household_size": 3,
+    },
+    "rice": {
+        "name": "Rice",
+        "category": "grains",
+        "quantity_current": 5.0,
+        "perishable": False,
+    },
+    "eggs": {
+        "name": "Eggs",
+        "category": "dairy",
+        "quantity_current": 1.5,
+        "perishable": True,
+        "expiry_date": date.today() + timedelta(days=12),
+    },
+}
+
+
+def test_extract_features_batch_matches_extract_features():
+    """Batched feature rows equal extract_features for each date."""
+    # Spans weekends, month and year boundaries, and the expiry dates
+    start = datetime(2024, 12, 27, 8, 15)
+    dates = [start + timedelta(hours=17 * i) for i in range(60)]
+
+    items = [
+        ITEMS["milk"],
+        ITEMS["rice"],
+        ITEMS["eggs"],
+        {"perishable": True, "expiry_date": "2025-01-10T18:00:00"},
+        {"perishable": True, "expiry_date": "not a date"},
+    ]
+
+    for item_data in items:
+        batch = extract_features_batch(item_data, dates)
+        assert batch.shape == (len(dates), 8)
+
+        for row, current_date in zip(batch, dates, strict=True):
+            single = extract_features(item_data, current_date)
+            assert torch.allclose(row, single, atol=1e-6), (item_data, current_date)
+
+
+def make_trainer(tmp: str, name: str) -> OnlineForecastTrainer:
+    """Create a trainer with freshly initialized, identically seeded models."""
+    trainer = OnlineForecastTrainer(
+        model_dir=Path(tmp) / name,
+        pretrained_dir=Path(tmp) / "no_pretrained",
+    )
+    torch.manual_seed(0)
+    for item_id, item_data in ITEMS.items():
+        trainer.get_or_create_model(item_id, item_data)
+    return trainer
+
+
+def test_update_models_batch_matches_update_model():
+    """A batched update leaves every model as per-item updates would."""
+    start = datetime.now().replace(microsecond=0)
+    updates = [
+        ("milk", 1.8, ITEMS["milk"], start),
+        ("rice", 4.9, ITEMS["rice"], start),
+        ("eggs", 1.4, ITEMS["eggs"], start),
+        # Repeated items are applied in order
+        ("milk", 1.5, ITEMS["milk"], start + timedelta(hours=12)),
+        # Restock: state is reset without learning
+        ("rice", 10.0, ITEMS["rice"], start + timedelta(hours=12)),
+        ("milk", 1.1, ITEMS["milk"], start + timedelta(days=1)),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sequential = make_trainer(tmp, "sequential")
+        batched = make_trainer(tmp, "batched")
+
+        expected = {}
+        for item_id, observation, item_data, timestamp in updates:
+            expected[item_id] = sequential.update_model(item_id, observation, item_data, timestamp)
+
+        results = batched.update_models_batch(updates)
+
+        assert results.keys() == expected.keys()
+        for item_id, metrics in expected.items():
+            for key, value in metrics.items():
+                assert abs(results[item_id][key] - value) < 1e-4, (item_id, key)
+
+            info_a = sequential.models[item_id]
+            info_b = batched.models[item_id]
+            assert torch.allclose(info_a["state"], info_b["state"], atol=1e-5), item_id
+            assert torch.allclose(
+                info_a["model"].state_cov, info_b["model"].state_cov, atol=1e-5
+            ), item_id
+            assert float(info_a["prev_qty"]) == float(info_b["prev_qty"])
+            assert len(info_a["observations"]) == len(info_b["observations"])
+
+            params_a = dict(info_a["model"].named_parameters())
+            for name, param in info_b["model"].named_parameters():
+                assert torch.allclose(params_a[name], param, atol=1e-5), (item_id, name)
+
+
+def test_save_and_load_all_models_round_trip():
+    """Models saved to the shard come back with weights, state and stats."""
+    start = datetime.now().replace(microsecond=0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trainer = make_trainer(tmp, "models")
+        for step, quantity in enumerate([1.8, 1.5, 1.1]):
+            timestamp = start + timedelta(hours=12 * step)
+            for item_id, item_data in ITEMS.items():
+                trainer.update_model(item_id, quantity, item_data, timestamp)
+
+        trainer.save_all_models()
+        assert sorted(p.name for p in (Path(tmp) / "models").iterdir()) == [
+            "meta.json",
+            "models.pt",
+        ]
+
+        restored = OnlineForecastTrainer(
+            model_dir=Path(tmp) / "models",
+            pretrained_dir=Path(tmp) / "no_pretrained",
+        )
+        assert restored.load_all_models() == len(ITEMS)
+
+        for item_id in ITEMS:
+            saved = trainer.models[item_id]
+            loaded = restored.models[item_id]
+
+            params = dict(saved["model"].named_parameters())
+            for name, param in loaded["model"].named_parameters():
+                assert torch.equal(params[name], param), (item_id, name)
+            assert torch.equal(saved["model"].state_cov, loaded["model"].state_cov)
+            assert loaded["model"].training_steps == saved["model"].training_steps
+
+            # The filtered state is restored, not reset to zeros
+            assert torch.equal(saved["state"], loaded["state"]), item_id
+            assert loaded["last_trained"] == saved["last_trained"]
+            assert loaded["ewma_error"] == saved["ewma_error"]
+            assert loaded["errors"].values().tolist() == saved["errors"].values().tolist()
+
+        # Only the requested items are loaded
+        partial = OnlineForecastTrainer(
+            model_dir=Path(tmp) / "models",
+            pretrained_dir=Path(tmp) / "no_pretrained",
+        )
+        assert partial.load_all_models({"rice"}) == 1
+        assert list(partial.models) == ["rice"]
+
+
+def make_history(count: int = 300) -> tuple:
+    """Steady consumption with weekly restocks, twice-daily readings."""
+    rng = np.random.default_rng(0)
+    steps = np.arange(count)
+    values = np.maximum(0.0, 10.0 - 0.05 * (steps % 150) + rng.normal(0, 0.1, count))
+    start = datetime(2025, 1, 1)
+    times = [start + timedelta(hours=12 * i) for i in range(count)]
+    return values.astype(np.float32), times
+
+
+def fresh_model(values: np.ndarray, times: list, seed: int) -> tuple:
+    """Seeded model and initial state, as _retrain_from_scratch builds them."""
+    torch.manual_seed(seed)
+    model = ConsumptionForecaster(
+        state_dim=4,
+        feature_dim=8,
+        process_noise_std=0.1,
+        obs_noise_std=0.05,
+        learning_rate=0.001,
+    )
+    recent = list(zip(values[:10].tolist(), times[:10], strict=True))
+    return model, model.initialize_state(float(values[0]), recent)
+
+
+def weights(model: ConsumptionForecaster) -> torch.Tensor:
+    """All parameters as one flat vector."""
+    return torch.cat([p.detach().flatten() for p in model.parameters()])
+
+
+def filter_mse(model: ConsumptionForecaster, state, values, features) -> float:
+    """One-step prediction error of the model over the history, no learning."""
+    model.state_cov = torch.eye(model.state_dim) * 0.1
+    _, errors = model.update_batch(
+        state, torch.from_numpy(values), features, perform_learning=False
+    )
+    return float((errors**2).mean())
+
+
+def replay(values, times, features, seed: int) -> ConsumptionForecaster:
+    """The original retrain: one update() step per observation."""
+    model, state = fresh_model(values, times, seed)
+    for value, row in zip(values.tolist(), features, strict=True):
+        state, _ = model.update(state, value, row, perform_learning=True)
+    return model
+
+
+def test_update_batch_chunk_of_one_matches_update():
+    """With chunk_size=1, update_batch takes exactly the update() steps."""
+    values, times = make_history(120)
+    features = extract_features_batch({}, times)
+
+    expected = replay(values, times, features, seed=0)
+
+    model, state = fresh_model(values, times, seed=0)
+    model.update_batch(state, torch.from_numpy(values), features, chunk_size=1)
+
+    assert model.training_steps == expected.training_steps
+    assert torch.allclose(weights(model), weights(expected), atol=1e-5)
+    assert torch.allclose(model.state_cov, expected.state_cov, atol=1e-5)
+
+
+def test_retrain_fit_matches_replay():
+    """A retrain learns about as much as the per-observation replay."""
+    values, times = make_history()
+    features = extract_features_batch({}, times)
+
+    for seed in range(3):
+        initial, initial_state = fresh_model(values, times, seed)
+        initial_weights = weights(initial)
+        untrained_mse = filter_mse(initial, initial_state, values, features)
+
+        expected = replay(values, times, features, seed)
+        expected_mse = filter_mse(expected, fresh_model(values, times, seed)[1], values, features)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            trainer = OnlineForecastTrainer(
+                model_dir=Path(tmp) / "models",
+                pretrained_dir=Path(tmp) / "no_pretrained",
+            )
+            trainer.get_or_create_model("rice", ITEMS["rice"])
+            info = trainer.models["rice"]
+            info["observations"].extend(
+                zip(values.tolist(), np.array(times, dtype="datetime64[s]"), strict=True)
+            )
+
+            torch.manual_seed(seed)
+            trainer._retrain_from_scratch("rice", {})
+            retrained = info["model"]
+
+        retrained_mse = filter_mse(retrained, fresh_model(values, times, seed)[1], values, features)
+
+        # The weights move about as far as in the replay (a single batched
+        # step moved them ~300x less), and the fit is comparable
+        moved = float((weights(retrained) - initial_weights).norm())
+        expected_moved = float((weights(expected) - initial_weights).norm())
+        assert 0.5 < moved / expected_moved < 2.0, (seed, moved, expected_moved)
+        assert retrained_mse < 2.0 * expected_mse, (seed, retrained_mse, expected_mse)
+        assert retrained_mse < 0.75 * untrained_mse, (seed, retrained_mse, untrained_mse)
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_extract_features_batch_matches_extract_features,
+        test_update_models_batch_matches_update_model,
+        test_save_and_load_all_models_round_trip,
+        test_update_batch_chunk_of_one_matches_update,
+        test_retrain_fit_matches_replay,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e!r}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for receipt image preprocessing.
+
+Uses synthetic receipts drawn with OpenCV (no Tesseract or LLM calls) to
+check resizing, thresholding and deskewing ahead of OCR.
+
+Run with: python tests/test_receipt_ocr.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cv2
+import numpy as np
+
+from src.ingestion.receipt_ocr import ReceiptOCR
+
+
+def make_receipt(height: int = 1200, width: int = 1000) -> np.ndarray:
+    """White grayscale image with a centered block of receipt lines."""
+    image = np.full((height, width), 255, np.uint8)
+    top = height // 4
+    for i, y in enumerate(range(top, height - top, height // 30)):
+        text = f"ITEM {i:02d} GROCERY   {i * 1.37:6.2f}"
+        cv2.putText(image, text, (width // 5, y), cv2.FONT_HERSHEY_SIMPLEX,
+                    height / 1400, 0, max(1, height // 600))
+    return image
+
+
+def rotate(image: np.ndarray, degrees: float) -> np.ndarray:
+    """Rotate about the center, filling the corners with white."""
+    height, width = image.shape
+    matrix = cv2.getRotationMatrix2D((width // 2, height // 2), degrees, 1.0)
+    return cv2.warpAffine(image, matrix, (width, height), borderValue=255)
+
+
+def text_angle(image: np.ndarray) -> float:
+    """Skew of the dark pixels in the central region, in degrees."""
+    height, width = image.shape
+    center = image[height // 6:-height // 6, width // 6:-width // 6]
+    angle = cv2.minAreaRect(cv2.findNonZero(255 - center))[-1]
+    return (angle + 45) % 90 - 45
+
+
+def test_preprocess_image_size():
+    """Short images are upscaled and tall ones downscaled to 1200px."""
+    ocr = ReceiptOCR(use_llm=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for height, expected in [(600, 1200), (1400, 1400), (2400, 1200)]:
+            path = str(Path(tmp) / f"receipt_{height}.png")
+            cv2.imwrite(path, cv2.cvtColor(make_receipt(height, height // 2), cv2.COLOR_GRAY2BGR))
+
+            processed = ocr._preprocess_image(path)
+            assert processed.shape == (expected, expected * (height // 2) // height), height
+            # Thresholded: only black text on white
+            assert set(np.unique(processed)) <= {0, 255}, height
+            assert 0.5 < (processed == 255).mean() < 1.0, height
+
+        try:
+            ocr._preprocess_image(str(Path(tmp) / "missing.png"))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("missing image was accepted")
+
+
+def test_deskew_straightens_text():
+    """Skewed text comes back level; straight text is left untouched."""
+    ocr = ReceiptOCR(use_llm=False)
+    receipt = make_receipt()
+
+    assert ocr._deskew(receipt) is receipt
+
+    for degrees in (3.0, -4.0, 8.0):
+        skewed = rotate(receipt, degrees)
+        assert abs(text_angle(skewed) + degrees) < 0.5, degrees
+
+        deskewed = ocr._deskew(skewed)
+        assert deskewed.shape == receipt.shape
+        assert abs(text_angle(deskewed)) < 0.5, (degrees, text_angle(deskewed))
+
+
+def test_deskew_fills_corners_with_white():
+    """The corners uncovered by the rotation match the white background."""
+    ocr = ReceiptOCR(use_llm=False)
+    deskewed = ocr._deskew(rotate(make_receipt(), 8.0))
+
+    for corner in (deskewed[:20, :20], deskewed[:20, -20:],
+                   deskewed[-20:, :20], deskewed[-20:, -20:]):
+        assert corner.min() == 255
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_preprocess_image_size,
+        test_deskew_straightens_text,
+        test_deskew_fills_corners_with_white,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e!r}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the encrypted log viewer (scripts/view_logs.py).
+
+Writes a small encrypted log in the logger's format (one base64 Fernet
+token per line) and checks reading it back, the --grep and --tail filtering and
+the --tail argument check.
+
+Run with: python tests/test_view_logs.py
+"""
+
+import argparse
+import base64
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root and scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import view_logs
+from cryptography.fernet import Fernet
+
+
+def write_log(path: Path, key: bytes, records: list) -> None:
+    """Write records as an encrypted log file."""
+    cipher = Fernet(key)
+    with open(path, "wb") as f:
+        for record in records:
+            f.write(base64.b64encode(cipher.encrypt(record.encode("utf-8"))) + b"\n")
+
+
+def make_records(count: int) -> list:
+    """Build log records; every third one is an error with a traceback."""
+    records = []
+    for i in range(count):
+        if i % 3 == 0:
+            records.append(f"{i} ERROR agent failed\nTraceback (most recent call last):\n  boom")
+        else:
+            records.append(f"{i} INFO agent ok")
+    return records
+
+
+def test_read_records():
+    """Every record, including multi-line ones, is read back in order."""
+    key = Fernet.generate_key()
+    records = make_records(50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "p3edge.log.enc"
+        write_log(log_path, key, records)
+
+        assert view_logs.decrypt_log_file(str(log_path), key) == records
+
+
+def test_undecryptable_line():
+    """A corrupt line is reported in place instead of aborting the read."""
+    key = Fernet.generate_key()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "p3edge.log.enc"
+        write_log(log_path, key, ["1 INFO first"])
+        with open(log_path, "ab") as f:
+            f.write(b"not-a-token\n")
+
+        lines = view_logs.decrypt_log_file(str(log_path), key)
+        assert lines == ["1 INFO first", "[DECRYPTION ERROR at line 2]"]
+
+
+def test_grep_and_tail():
+    """grep selects whole records and tail keeps the last N of them."""
+    key = Fernet.generate_key()
+    # More records than one grep batch, so matches span batches
+    count = view_logs.GREP_BATCH_SIZE * 2 + 7
+    records = make_records(count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "p3edge.log.enc"
+        write_log(log_path, key, records)
+
+        errors = [r for r in records if "ERROR" in r]
+        assert view_logs.decrypt_log_file(str(log_path), key, grep_bytes=b"ERROR") == errors
+
+        # Multi-line records are kept intact when a later line matches
+        assert view_logs.decrypt_log_file(
+            str(log_path), key, grep_bytes=b"boom", tail=2
+        ) == errors[-2:]
+
+        assert view_logs.decrypt_log_file(str(log_path), key, tail=5) == records[-5:]
+        assert view_logs.decrypt_log_file(
+            str(log_path), key, grep_bytes=b"no such text", tail=5
+        ) == []
+
+
+def test_grep_rejects_newline():
+    """A pattern with a newline could match across two records."""
+    records = [b"1 INFO first", b"2 INFO second"]
+    try:
+        view_logs._find_matching_records(records, b"first\n2")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("pattern containing a newline was accepted")
+
+    assert view_logs._find_matching_records(records, b"second") == [1]
+
+
+def test_tail_must_not_be_negative():
+    """--tail rejects negative and non-numeric values at parse time."""
+    assert view_logs._non_negative_int("0") == 0
+    assert view_logs._non_negative_int("25") == 25
+
+    for value in ("-1", "ten"):
+        try:
+            view_logs._non_negative_int(value)
+        except argparse.ArgumentTypeError:
+            pass
+        else:
+            raise AssertionError(f"--tail {value} was accepted")
+
+
+def main():
+    """Run all tests."""
+    tests = [
+        test_read_records,
+        test_undecryptable_line,
+        test_grep_and_tail,
+        test_grep_rejects_newline,
+        test_tail_must_not_be_negative,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e!r}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())